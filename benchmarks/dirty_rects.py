@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+# Run without a visible window from the project root
+os.environ.setdefault("SDL_VIDEODRIVER","dummy")
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0,os.getcwd())
+
+from frostlight_engine import *
+from data.classes.game_scene import GameScene
+
+FRAMES = 600
+
+class Benchmark(Engine):
+    def __init__(self,dirty_rects:bool):
+        super().__init__(dirty_rects=dirty_rects,logging=False,window_size=[1920,1080])
+        self.scenes.register("game",GameScene)
+        self.scenes.push("game")
+        self.full_updates = 0
+
+        # Warm up until the one screen level is loaded and running
+        for _ in range(60):
+            self._frame(1/60)
+
+    def measure(self) -> float:
+
+        # Count frames that fell back to a full display update
+        get_update_rects = self.window._get_update_rects
+        def counted_update_rects():
+            rects = get_update_rects()
+            if rects == None:
+                self.full_updates += 1
+            return rects
+        self.window._get_update_rects = counted_update_rects
+
+        start = time.process_time()
+        for _ in range(FRAMES):
+            self._frame(1/60)
+        return (time.process_time()-start)/FRAMES*1000
+
+if __name__ == "__main__":
+    for dirty_rects in [False,True]:
+        benchmark = Benchmark(dirty_rects)
+        print(f"dirty_rects={dirty_rects}: {benchmark.measure():.3f} ms CPU per frame, {benchmark.full_updates} of {FRAMES} frames were full updates")
+        pygame.display.quit()
@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+
+# Run without a visible window from the project root
+os.environ.setdefault("SDL_VIDEODRIVER","dummy")
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0,os.getcwd())
+
+from frostlight_engine import *
+
+EVENTS = 10000
+ROUNDS = 20
+
+class Benchmark(Engine):
+    def __init__(self):
+        super().__init__(logging=False,window_size=[640,360],logical_size=[640,360])
+
+    def event_keydown(self,key:int,unicode:str):
+        pass
+
+class LegacyBenchmark(Benchmark):
+    def __init__(self):
+        super().__init__()
+        pygame.event.set_allowed(pygame.MOUSEMOTION)
+
+    def _get_events(self):
+
+        # If/elif chain the engine used before the dispatch table, every hook is called
+        self.input._update()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit()
+            elif event.type == pygame.WINDOWMOVED:
+                self.event_window_move([event.x,event.y])
+                self.event_window_changed(event)
+                self.event_event(event)
+            elif event.type == pygame.VIDEORESIZE:
+                self.event_window_resize([event.w,event.h])
+                self.event_window_changed(event)
+                self.event_event(event)
+            elif event.type == pygame.KEYDOWN:
+                self.input._handle_key_event(event)
+                self.event_keydown(event.key,event.unicode)
+                self.event_event(event)
+            elif event.type == pygame.KEYUP:
+                self.input._handle_key_event(event)
+                self.event_keyup(event.key,event.unicode)
+                self.event_event(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.input._handle_mouse_event(event)
+                self.event_mouse_buttondown(event.button,self.window.map_position(event.pos))
+                self.event_event(event)
+            elif event.type == pygame.MOUSEBUTTONUP:
+                self.input._handle_mouse_event(event)
+                self.event_mouse_buttonup(event.button,self.window.map_position(event.pos))
+                self.event_event(event)
+            elif event.type == pygame.MOUSEMOTION:
+                self.event_event(event)
+
+def create_events() -> list:
+
+    # Mouse motion heavy mix like a player moving the mouse while pressing keys
+    events = []
+    for index in range(EVENTS):
+        if index%5 < 3:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION,pos=(index%640,index%360),rel=(1,0),buttons=(0,0,0)))
+        elif index%5 == 3:
+            events.append(pygame.event.Event(pygame.KEYDOWN,key=pygame.K_a,unicode="a",mod=0,scancode=4))
+        else:
+            events.append(pygame.event.Event(pygame.KEYUP,key=pygame.K_a,unicode="a",mod=0,scancode=4))
+    return events
+
+def measure(engine:Engine,events:list) -> float:
+
+    # Post and dispatch the events in chunks the event queue can hold
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        for chunk in range(0,len(events),1000):
+            for event in events[chunk:chunk+1000]:
+                pygame.event.post(event)
+            engine._get_events()
+    return (time.process_time()-start)/ROUNDS*1000
+
+if __name__ == "__main__":
+    events = create_events()
+    for name,engine_class in [["if/elif chain",LegacyBenchmark],["dispatch table",Benchmark]]:
+        engine = engine_class()
+        pygame.event.clear()
+        print(f"{name}: {measure(engine,events):.2f} ms CPU per {EVENTS} events")
+        pygame.display.quit()
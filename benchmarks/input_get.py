@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+# Run without a visible window from the project root
+os.environ.setdefault("SDL_VIDEODRIVER","dummy")
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0,os.getcwd())
+
+from frostlight_engine import *
+from frostlight_engine import _KEYBOARD,_MOUSE,_JOYSTICK
+
+CALLS = 1000000
+NAMES = ["left","right","up","accept"]
+
+class LegacyInput(Input):
+    def get(self,name:str,controller_index:int=-1) -> int|float:
+
+        # Binding walk the engine used before the per frame snapshot
+        try:
+            for key in self._registered_input[name]:
+                if key[0][1] == _KEYBOARD:
+                    if self._keys[key[0][0]][key[1]]:
+                        return 1
+                elif key[0][1] == _MOUSE:
+                    if self.mouse.buttons[key[0][0]][key[1]]:
+                        return 1
+                elif key[0][1] == _JOYSTICK:
+                    if controller_index == -1:
+                        for i in range(len(self._joystick_devices)):
+                            input_value = self._joystick_devices[i]._get_input(key[0][0],key[1])
+                            if input_value != False or input_value != 0.0:
+                                return input_value
+                    else:
+                        if controller_index < len(self._joystick_devices):
+                            input_value = self._joystick_devices[controller_index]._get_input(key[0][0],key[1])
+                        else:
+                            return 0
+                        if input_value != False or input_value != 0.0:
+                            return input_value
+        except:
+            return 0
+        return 0
+
+class Benchmark(Engine):
+    def __init__(self):
+        super().__init__(logging=False,window_size=[640,360],logical_size=[640,360])
+        self.input.autosave = False
+
+def measure(engine:Engine) -> float:
+
+    # Right is held, the other actions walk all of their bindings
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN,key=pygame.K_d,unicode="d",mod=0,scancode=7))
+    engine._get_events()
+    engine._get_events()
+    get = engine.input.get
+    names = NAMES*(CALLS//len(NAMES))
+    start = time.process_time()
+    for name in names:
+        get(name)
+    return time.process_time()-start
+
+if __name__ == "__main__":
+    for name,input_class in [["binding walk",LegacyInput],["frame snapshot",Input]]:
+        engine = Benchmark()
+        engine.input = input_class(engine)
+        engine._build_event_table()
+        print(f"{name}: {measure(engine)*1000:.0f} ms CPU per {CALLS} get calls")
+        pygame.display.quit()
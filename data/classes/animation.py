@@ -0,0 +1,159 @@
+import pygame
+
+# Frame strips shared by every animation, keyed by (paths, frame size, scaled size)
+_frame_cache = {}
+
+class Animation:
+    def __init__(self,engine,size:list[int,int]) -> None:
+
+        """
+        Initialise an animation component.
+
+        Frames are sliced, scaled and flipped once when an animation is added and
+        stored in a shared cache, so many entities using the same sheet share the frames.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - size (list[int,int]): Size every frame is scaled to.
+        """
+
+        self.engine = engine
+        self.size = (int(size[0]),int(size[1]))
+        self.animations = {}
+        self.current = None
+        self.elapsed = 0.0
+        self.flipped = False
+        self.finished = False
+
+    def add(self,name:str,paths:str|list[str],frame_width:int=None,frame_height:int=None,frame_time:float=0.1,loop:bool=True) -> None:
+
+        """
+        Adds a new animation from a sprite sheet or a list of images.
+
+        Args:
+
+        - name (str): Name of the animation.
+        - paths (str | list[str]): Sprite sheet or list of sprite sheets, sliced from left to right.
+        - frame_width (int)=None: Width of a frame in the sheet, the whole image is one frame if None.
+        - frame_height (int)=None: Height of a frame in the sheet, defaults to the sheet height.
+        - frame_time (float)=0.1: Seconds every frame is shown.
+        - loop (bool)=True: Restarts the animation after the last frame.
+
+        Example:
+        ```
+        self.animation.add("run","data/sprites/player_run.png",16,16,0.08)
+        ```
+        """
+
+        if type(paths) == str:
+            paths = [paths]
+
+        strip = self._load_strip(tuple(paths),frame_width,frame_height)
+        self.animations[name] = [strip[0],strip[1],frame_time,loop]
+        if self.current == None:
+            self.play(name)
+
+    def play(self,name:str,restart:bool=False) -> None:
+
+        """
+        Switches to another animation.
+
+        Args:
+
+        - name (str): Name of the animation to play.
+        - restart (bool)=False: Restarts the animation if it is already playing.
+
+        Example:
+        ```
+        self.animation.play("jump")
+        ```
+        """
+
+        if name in self.animations and (name != self.current or restart):
+            self.current = name
+            self.elapsed = 0.0
+            self.finished = False
+
+    def has(self,name:str) -> bool:
+
+        """
+        Returns if an animation with the name was added.
+
+        Args:
+
+        - name (str): Name of the animation.
+        """
+
+        return name in self.animations
+
+    def update(self) -> None:
+
+        """
+        Advances the current animation by the engines delta time.
+        """
+
+        self.elapsed += self.engine.delta_time
+
+    def get_sprite(self) -> pygame.Surface:
+
+        """
+        Returns the frame to draw for the current time and facing direction.
+
+        Returns:
+
+        - The current frame as pygame.Surface.
+        """
+
+        frames,flipped_frames,frame_time,loop = self.animations[self.current]
+        index = int(self.elapsed/frame_time) if frame_time > 0 else 0
+        if index >= len(frames):
+            if loop:
+                index %= len(frames)
+            else:
+                index = len(frames)-1
+                self.finished = True
+
+        if self.flipped:
+            return flipped_frames[index]
+        return frames[index]
+
+    def _load_strip(self,paths:tuple[str],frame_width:int=None,frame_height:int=None) -> list[list,list]:
+
+        # Loads, slices, scales and flips sprite sheets only once
+        key = (paths,frame_width,frame_height,self.size)
+        if key in _frame_cache:
+            return _frame_cache[key]
+
+        frames = []
+        flipped_frames = []
+        for path in paths:
+            if len(paths) > 1:
+
+                # Combined strips reuse the frames of every single sheet
+                strip = self._load_strip((path,),frame_width,frame_height)
+                frames.extend(strip[0])
+                flipped_frames.extend(strip[1])
+                continue
+
+            sheet = pygame.image.load(path)
+            if pygame.display.get_surface() != None:
+                sheet = sheet.convert_alpha()
+
+            # Sheets are only sliced if a frame width is given
+            width = frame_width if frame_width != None else sheet.get_width()
+            height = frame_height if frame_height != None else sheet.get_height()
+            if width > sheet.get_width() or height > sheet.get_height() or width <= 0 or height <= 0:
+                raise ValueError(f"Frame size {width}x{height} does not fit into {path} ({sheet.get_width()}x{sheet.get_height()})")
+
+            for y in range(0,sheet.get_height()-height+1,height):
+                for x in range(0,sheet.get_width()-width+1,width):
+                    frame = pygame.transform.scale(sheet.subsurface(pygame.Rect(x,y,width,height)),self.size)
+                    frames.append(frame)
+                    flipped_frames.append(pygame.transform.flip(frame,True,False))
+
+        # Frames are reconverted by the window after display mode changes
+        _frame_cache[key] = [frames,flipped_frames]
+        self.engine.window.register_surface(_frame_cache[key],0,"Animation")
+        self.engine.window.register_surface(_frame_cache[key],1,"Animation")
+        return _frame_cache[key]
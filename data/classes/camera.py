@@ -1,12 +1,26 @@
-import pygame 
+import math
+import pygame
 
 class Camera:
-    def __init__(self,engine,x=0,y=0,width=1920,height=1080) -> None:
+    def __init__(self,engine,x=0,y=0,width=None,height=None) -> None:
         self.engine = engine
         self.x = x
         self.y = y
         self.width = width
         self.height = height
+        if width == None:
+            self.width = self.engine.window.get_logical_size()[0]
+        if height == None:
+            self.height = self.engine.window.get_logical_size()[1]
+
+        self.target = None
+        self.target_size = (0,0)
+        self.deadzone = (0,0)
+        self.smoothing = 0.0
+        self.bounds = None
+
+        self._view_key = None
+        self._view_rect = pygame.Rect(0,0,0,0)
 
     def set_pos(self,x,y):
         self.x = x
@@ -18,4 +32,71 @@ class Camera:
 
     def center_rect(self,rect:pygame.Rect):
         self.x = self.width/2-rect.width/2
-        self.y = self.height/2-rect.height/2
\ No newline at end of file
+        self.y = self.height/2-rect.height/2
+
+    def get_view_rect(self) -> pygame.Rect:
+
+        # World space area seen by the camera, only rebuilt when the camera changed
+        key = (self.x,self.y,self.width,self.height)
+        if key != self._view_key:
+            self._view_key = key
+            self._view_rect = pygame.Rect(math.floor(-self.x),math.floor(-self.y),math.ceil(self.width),math.ceil(self.height))
+        return self._view_rect
+
+    def is_visible(self,rect:pygame.Rect) -> bool:
+
+        # Checks if a world space rect overlaps the camera view
+        return self.get_view_rect().colliderect(rect)
+
+    def follow(self,target,size=(0,0),deadzone=(0,0),smoothing=0.0):
+
+        # Tracks an object with x and y attributes, None stops following
+        self.target = target
+        self.target_size = size
+        self.deadzone = deadzone
+        self.smoothing = smoothing
+
+    def set_bounds(self,rect:pygame.Rect=None):
+
+        # Keeps the view inside a world space rect, None removes the limit
+        self.bounds = rect
+
+    def update(self):
+        if self.target == None:
+            return
+
+        # Target center relative to the view center
+        center_x = self.target.x+self.target_size[0]/2
+        center_y = self.target.y+self.target_size[1]/2
+        offset_x = center_x+self.x-self.width/2
+        offset_y = center_y+self.y-self.height/2
+
+        # Only move once the target leaves the deadzone
+        move_x = 0.0
+        move_y = 0.0
+        if abs(offset_x) > self.deadzone[0]/2:
+            move_x = offset_x-math.copysign(self.deadzone[0]/2,offset_x)
+        if abs(offset_y) > self.deadzone[1]/2:
+            move_y = offset_y-math.copysign(self.deadzone[1]/2,offset_y)
+
+        # Frame rate independent smoothing
+        if self.smoothing > 0:
+            factor = 1-math.exp(-self.engine.delta_time/self.smoothing)
+            move_x *= factor
+            move_y *= factor
+
+        x = self.x-move_x
+        y = self.y-move_y
+
+        # Clamp view to bounds
+        if self.bounds != None:
+            if self.bounds.width <= self.width:
+                x = self.width/2-self.bounds.centerx
+            else:
+                x = min(max(x,self.width-self.bounds.right),-self.bounds.left)
+            if self.bounds.height <= self.height:
+                y = self.height/2-self.bounds.centery
+            else:
+                y = min(max(y,self.height-self.bounds.bottom),-self.bounds.top)
+
+        self.set_pos(x,y)
@@ -0,0 +1,46 @@
+import os
+import json
+from frostlight_engine import Scene
+from data.classes.tilemap import Tilemap
+from data.classes.player import Player
+from data.classes.camera import Camera
+from data.classes.lighting import Lighting
+from data.classes.particles import ParticleSystem
+
+class GameScene(Scene):
+    def load(self):
+
+        # Tile sprites are declared as assets, so preloading the scene reads them on a worker thread
+        with open(os.path.join("data","tilemapconfig.json"),"r") as f:
+            self.assets = [path for path in json.load(f).get("sprites",{}).values() if type(path) == str]
+        super().load()
+
+    def start(self):
+
+        # Everything is queued with explicit layers, the player is on layer 1 and the lighting on layer 10
+        self.camera = Camera(self.engine)
+        self.tilemap = Tilemap(self.engine,camera=self.camera,images=self.images,layer=-20)
+        self.player = Player(self.engine,400,400,camera=self.camera,tilemap=self.tilemap)
+        self.particles = ParticleSystem(self.engine,camera=self.camera,tilemap=self.tilemap,layer=-10)
+        self.particles.set_palette([[220,220,220],[170,170,170]])
+        self.player.particles = self.particles
+        self.tilemap.load_tilemap(os.path.join("data","tilemap.json"))
+        self.lighting = Lighting(self.engine,camera=self.camera,tilemap=self.tilemap,ambient=(150,150,165))
+        self.player_light = self.lighting.add_light(self.player.x,self.player.y,400,(140,130,110),static=False)
+
+    def update(self):
+        with self.engine.profiler.scope("player.update"):
+            self.player.update()
+        self.particles.update()
+        self.camera.update()
+        self.player_light.x = self.player.x+self.player.SIZE/2
+        self.player_light.y = self.player.y+self.player.SIZE/2
+        self.lighting.update()
+        self.engine.debug_overlay.set("Entities",1+self.particles.count)
+
+    def draw(self):
+        self.engine.window.fill([100,100,100])
+        self.tilemap.draw()
+        self.particles.draw()
+        self.player.draw()
+        self.lighting.draw()
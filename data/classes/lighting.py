@@ -0,0 +1,281 @@
+import math
+import numpy
+import pygame
+from data.classes.camera import Camera
+
+class Light:
+    def __init__(self,x:float,y:float,radius:float,color:list[int,int,int]=(255,255,255),static:bool=True) -> None:
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.color = tuple(color)
+        self.static = static
+        self.enabled = True
+
+        self._key = None
+        self._surface = None
+
+class Lighting:
+    def __init__(self,engine,camera:Camera=None,tilemap=None,ambient:list[int,int,int]=(40,40,50),scale:int=4,chunk_size:int=16,layer:int=10) -> None:
+
+        """
+        Initialise a lighting pass with tiles as shadow casters.
+
+        Occluder edges are built per chunk from the tilemaps solid mask and only rebuilt for chunks that changed.
+        The light map is rendered at a reduced resolution, scaled up and multiplied onto the frame.
+        Static lights keep their shadowed surface until an occluder changes.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - camera (Camera)=None: Camera the lights are drawn relative to.
+        - tilemap (Tilemap)=None: Solid tiles of the tilemap cast shadows if set.
+        - ambient (list[int,int,int])=(40,40,50): Light color of unlit areas.
+        - scale (int)=4: The light map is rendered at 1/scale of the logical resolution.
+        - chunk_size (int)=16: Width and height of an occluder chunk in tiles.
+        - layer (int)=10: Render queue layer of the light map.
+        """
+
+        self.engine = engine
+        self.camera = camera
+        if camera == None:
+            self.camera = Camera(self.engine)
+        self.tilemap = tilemap
+
+        self.ambient = tuple(ambient)
+        self.scale = max(int(scale),1)
+        self.chunk_size = chunk_size
+        self.layer = layer
+        self.enabled = True
+        self.lights = []
+
+        # Occluder edges per chunk as rows of x1,y1,x2,y2,side
+        self._chunks = {}
+        self._chunk_masks = {}
+        self._mask = None
+        self._version = 0
+
+        self._gradients = {}
+        self._light_map = None
+        self._buffer = None
+
+        # Light surfaces show up in the engines memory report
+        self.engine.memory.track(self,"_gradients","Lighting")
+        self.engine.memory.track(self,"_light_map","Lighting")
+        self.engine.memory.track(self,"_buffer","Lighting")
+
+    def add_light(self,x:float,y:float,radius:float,color:list[int,int,int]=(255,255,255),static:bool=True) -> Light:
+
+        """
+        Adds a point light.
+
+        Args:
+
+        - x (float): X position in world space.
+        - y (float): Y position in world space.
+        - radius (float): Radius of the light in pixels.
+        - color (list[int,int,int])=(255,255,255): Color of the light.
+        - static (bool)=True: Static lights are only rendered again when an occluder changes, move dynamic lights by setting x and y.
+
+        Returns:
+
+        - The new Light.
+
+        Example:
+        ```
+        self.player_light = self.lighting.add_light(self.player.x,self.player.y,300,static=False)
+        ```
+        """
+
+        light = Light(x,y,radius,color,static)
+        self.lights.append(light)
+        return light
+
+    def remove_light(self,light:Light) -> None:
+
+        """
+        Removes a light added with add_light.
+
+        Args:
+
+        - light (Light): The light to remove.
+        """
+
+        if light in self.lights:
+            self.lights.remove(light)
+
+    def update(self) -> None:
+
+        """
+        Rebuilds the occluder edges of chunks whose tiles changed.
+        """
+
+        if self.tilemap == None:
+            return
+
+        # The tilemap creates a new mask after every change
+        mask = self.tilemap.get_solid_mask()
+        if mask is self._mask:
+            return
+        self._mask = mask
+
+        rebuilt = False
+        for chunk_y in range(0,mask.shape[0],self.chunk_size):
+            for chunk_x in range(0,mask.shape[1],self.chunk_size):
+                key = (chunk_x,chunk_y)
+                snapshot = mask[max(chunk_y-1,0):chunk_y+self.chunk_size+1,max(chunk_x-1,0):chunk_x+self.chunk_size+1]
+                if key in self._chunk_masks and numpy.array_equal(self._chunk_masks[key],snapshot):
+                    continue
+                self._chunk_masks[key] = snapshot.copy()
+                self._chunks[key] = self._build_chunk(mask,chunk_x,chunk_y)
+                rebuilt = True
+
+        # Chunks outside of a smaller tilemap are removed
+        for key in list(self._chunks):
+            if key[0] >= mask.shape[1] or key[1] >= mask.shape[0]:
+                del self._chunks[key]
+                del self._chunk_masks[key]
+                rebuilt = True
+
+        if rebuilt:
+            self._version += 1
+
+    def _build_chunk(self,mask:numpy.ndarray,chunk_x:int,chunk_y:int) -> numpy.ndarray:
+
+        # Tiles outside of the tilemap are empty
+        padded = numpy.pad(mask,1)
+        tile_size = self.tilemap.tile_size
+        end_x = min(chunk_x+self.chunk_size,mask.shape[1])
+        end_y = min(chunk_y+self.chunk_size,mask.shape[0])
+        solid = padded[chunk_y+1:end_y+1,chunk_x+1:end_x+1]
+        exposed = {
+            0:solid & ~padded[chunk_y:end_y,chunk_x+1:end_x+1],
+            1:solid & ~padded[chunk_y+2:end_y+2,chunk_x+1:end_x+1],
+            2:solid & ~padded[chunk_y+1:end_y+1,chunk_x:end_x],
+            3:solid & ~padded[chunk_y+1:end_y+1,chunk_x+2:end_x+2]
+        }
+
+        # Neighbouring exposed sides are merged into one long edge
+        edges = []
+        for side in [0,1]:
+            y_offset = 0 if side == 0 else tile_size
+            for row,line in enumerate(exposed[side]):
+                start = None
+                for column,value in enumerate(list(line)+[False]):
+                    if value and start == None:
+                        start = column
+                    elif not value and start != None:
+                        y = (chunk_y+row)*tile_size+y_offset
+                        edges.append([(chunk_x+start)*tile_size,y,(chunk_x+column)*tile_size,y,side])
+                        start = None
+        for side in [2,3]:
+            x_offset = 0 if side == 2 else tile_size
+            for column,line in enumerate(exposed[side].T):
+                start = None
+                for row,value in enumerate(list(line)+[False]):
+                    if value and start == None:
+                        start = row
+                    elif not value and start != None:
+                        x = (chunk_x+column)*tile_size+x_offset
+                        edges.append([x,(chunk_y+start)*tile_size,x,(chunk_y+row)*tile_size,side])
+                        start = None
+
+        return numpy.array(edges,dtype=numpy.float32).reshape(-1,5)
+
+    def _get_edges(self,light:Light) -> numpy.ndarray:
+
+        # Edges of chunks touching the light
+        chunk_pixels = self.chunk_size*self.tilemap.tile_size
+        edges = []
+        for (chunk_x,chunk_y),chunk in self._chunks.items():
+            left = chunk_x*self.tilemap.tile_size
+            top = chunk_y*self.tilemap.tile_size
+            if len(chunk) > 0 and left-light.radius < light.x < left+chunk_pixels+light.radius and top-light.radius < light.y < top+chunk_pixels+light.radius:
+                edges.append(chunk)
+        if not edges:
+            return numpy.zeros((0,5),dtype=numpy.float32)
+        edges = numpy.concatenate(edges)
+
+        # Only edges facing away from the light inside its radius cast the shadow of their tiles
+        x1,y1,x2,y2,side = edges.T
+        facing_away = ((side == 0) & (light.y > y1)) | ((side == 1) & (light.y < y1)) | ((side == 2) & (light.x > x1)) | ((side == 3) & (light.x < x1))
+        near_x = numpy.clip(light.x,numpy.minimum(x1,x2),numpy.maximum(x1,x2))
+        near_y = numpy.clip(light.y,numpy.minimum(y1,y2),numpy.maximum(y1,y2))
+        in_range = (near_x-light.x)**2+(near_y-light.y)**2 < light.radius**2
+        return edges[facing_away & in_range]
+
+    def _get_gradient(self,radius:int,color:tuple) -> pygame.Surface:
+
+        # Radial falloff shared by all lights with the same size and color
+        key = (radius,color)
+        if key not in self._gradients:
+            distance = numpy.hypot(*numpy.meshgrid(numpy.arange(radius*2)-radius+0.5,numpy.arange(radius*2)-radius+0.5,indexing="ij"))/radius
+            intensity = numpy.clip(1-distance,0,1)**2
+            gradient = pygame.surfarray.make_surface((intensity[:,:,None]*color).astype(numpy.uint8))
+            if pygame.display.get_surface() != None:
+                gradient = gradient.convert()
+            self._gradients[key] = gradient
+        return self._gradients[key]
+
+    def _render_light(self,light:Light) -> pygame.Surface:
+
+        # Static lights keep their surface until they move or an occluder changes
+        key = (light.x,light.y,light.radius,light.color,self._version)
+        if light.static and light._key == key:
+            return light._surface
+
+        radius = max(int(light.radius/self.scale),1)
+        surface = self._get_gradient(radius,light.color).copy()
+
+        # Shadow of every edge is projected far past the light radius
+        if self.tilemap != None:
+            far = light.radius*4
+            for x1,y1,x2,y2,side in self._get_edges(light).tolist():
+                points = []
+                for x,y in [[x1,y1],[x2,y2],[(x1+x2)/2,(y1+y2)/2]]:
+                    length = max(math.hypot(x-light.x,y-light.y),0.001)
+                    points.append([x-light.x,y-light.y,length])
+                polygon = [[points[0][0],points[0][1]],[points[1][0],points[1][1]]]
+                for index in [1,2,0]:
+                    dx,dy,length = points[index]
+                    polygon.append([dx/length*far,dy/length*far])
+                pygame.draw.polygon(surface,(0,0,0),[[x/self.scale+radius,y/self.scale+radius] for x,y in polygon])
+
+        if light.static:
+            light._key = key
+            light._surface = surface
+        return surface
+
+    def draw(self) -> None:
+
+        """
+        Renders the light map and multiplies it onto the frame after all other queued sprites.
+        """
+
+        if not self.enabled:
+            return
+
+        # Buffers are rebuilt only if the logical resolution changes
+        width,height = self.engine.window.get_logical_size()
+        size = (max(width//self.scale,1),max(height//self.scale,1))
+        if self._light_map == None or self._light_map.get_size() != size:
+            self._light_map = pygame.Surface(size)
+        if self._buffer == None or self._buffer.get_size() != (width,height):
+            self._buffer = pygame.Surface((width,height))
+            if pygame.display.get_surface() != None:
+                self._buffer = self._buffer.convert()
+
+        # Add every light inside the view
+        self._light_map.fill(self.ambient)
+        view = self.camera.get_view_rect()
+        for light in self.lights:
+            if not light.enabled:
+                continue
+            if light.x+light.radius < view.left or light.x-light.radius > view.right or light.y+light.radius < view.top or light.y-light.radius > view.bottom:
+                continue
+            surface = self._render_light(light)
+            position = ((light.x+self.camera.x)/self.scale-surface.get_width()/2,(light.y+self.camera.y)/self.scale-surface.get_height()/2)
+            self._light_map.blit(surface,position,special_flags=pygame.BLEND_RGB_ADD)
+
+        pygame.transform.smoothscale(self._light_map,(width,height),self._buffer)
+        self.engine.window.submit(self._buffer,(0,0),layer=self.layer,blend=pygame.BLEND_RGB_MULT)
@@ -0,0 +1,113 @@
+import math
+import pygame
+from data.classes.camera import Camera
+
+class Parallax:
+    def __init__(self,engine,camera:Camera=None,layer:int=None) -> None:
+
+        """
+        Initialise a parallax background.
+
+        Every layer is tiled once into a surface covering the view, so drawing a layer
+        takes at most four blits no matter where the camera is.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - camera (Camera)=None: Camera the layers scroll with.
+        - layer (int)=None: Render queue layer of the background, drawn right away if None.
+        """
+
+        self.engine = engine
+        self.layer = layer
+        self.camera = camera
+        if camera == None:
+            self.camera = Camera(self.engine)
+
+        # Layers as [sprite, factor x, factor y, repeat y, tiled surface]
+        self.layers = []
+        self._view_size = None
+        self.engine.window.register_surface(self,"layers")
+
+    def add_layer(self,sprite:str|pygame.Surface,factor:float|list[float,float]=0.5,repeat_y:bool=False) -> None:
+
+        """
+        Adds a layer in front of all previously added layers.
+
+        Args:
+
+        - sprite (str | pygame.Surface): Image or path to the image of the layer.
+        - factor (float | list[float,float])=0.5: Scroll speed relative to the camera, 0 does not move and 1 moves with the tilemap.
+        - repeat_y (bool)=False: Repeats the layer vertically, otherwise it is only repeated horizontally.
+
+        Example:
+        ```
+        self.background.add_layer("data/sprites/background/mountains.png",0.2)
+        self.background.add_layer("data/sprites/background/trees.png",[0.6,0.3])
+        ```
+        """
+
+        if type(sprite) == str:
+            sprite = pygame.image.load(sprite)
+            if pygame.display.get_surface() != None:
+                sprite = sprite.convert_alpha()
+        if type(factor) in [int,float]:
+            factor = [factor,factor]
+
+        layer = [sprite,factor[0],factor[1],repeat_y,None]
+        self.layers.append(layer)
+
+    def clear(self) -> None:
+
+        """
+        Removes all layers.
+        """
+
+        self.layers = []
+
+    def _build(self,layer:list,view_size:list[int,int]) -> None:
+
+        # Tile the sprite until it covers the view, two copies of this surface then fill any scroll offset
+        sprite = layer[0]
+        columns = math.ceil(view_size[0]/sprite.get_width())
+        rows = math.ceil(view_size[1]/sprite.get_height()) if layer[3] else 1
+        tiled = pygame.Surface((columns*sprite.get_width(),rows*sprite.get_height()),pygame.SRCALPHA)
+        if pygame.display.get_surface() != None:
+            tiled = tiled.convert_alpha()
+        tiled.fblits([(sprite,(x*sprite.get_width(),y*sprite.get_height())) for y in range(rows) for x in range(columns)])
+        layer[4] = tiled
+
+    def draw(self) -> None:
+
+        """
+        Draws all layers from back to front.
+        """
+
+        # Tiled surfaces are only rebuilt when the logical resolution changes
+        view_size = tuple(self.engine.window.get_logical_size())
+        if view_size != self._view_size:
+            self._view_size = view_size
+            for layer in self.layers:
+                layer[4] = None
+
+        for layer in self.layers:
+            if layer[4] == None:
+                self._build(layer,view_size)
+            tiled = layer[4]
+            width,height = tiled.get_size()
+
+            # Wrap the scroll offset into the tiled surface
+            offset_x = (self.camera.x*layer[1])%width
+            columns = [offset_x-width,offset_x] if offset_x > 0 else [0]
+            if layer[3]:
+                offset_y = (self.camera.y*layer[2])%height
+                rows = [offset_y-height,offset_y] if offset_y > 0 else [0]
+            else:
+                rows = [self.camera.y*layer[2]]
+
+            for y in rows:
+                for x in columns:
+                    if self.layer == None:
+                        self.engine.window.render(tiled,(x,y))
+                    else:
+                        self.engine.window.submit(tiled,(x,y),self.layer)
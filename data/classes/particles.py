@@ -0,0 +1,198 @@
+import numpy
+import pygame
+from data.classes.camera import Camera
+
+class ParticleSystem:
+    def __init__(self,engine,camera:Camera=None,tilemap=None,capacity:int=20000,size:int=4,gravity:float=900.0,layer:int=None) -> None:
+
+        """
+        Initialise a particle system.
+
+        Particles are stored in preallocated numpy arrays and updated all at once,
+        every color of the palette is drawn with a single batched blit.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - camera (Camera)=None: Camera the particles are drawn relative to.
+        - tilemap (Tilemap)=None: Particles bounce off solid tiles if set.
+        - capacity (int)=20000: Maximum number of living particles.
+        - size (int)=4: Width and height of a particle in pixels.
+        - gravity (float)=900.0: Downwards acceleration in pixels per second squared.
+        - layer (int)=None: Render queue layer of the particles, drawn right away if None.
+        """
+
+        self.engine = engine
+        self.camera = camera
+        if camera == None:
+            self.camera = Camera(self.engine)
+        self.tilemap = tilemap
+        self.layer = layer
+
+        self.capacity = capacity
+        self.size = size
+        self.gravity = gravity
+        self.bounce = 0.4
+        self.friction = 0.6
+        self.count = 0
+
+        # Particle data, only the first count entries are alive
+        self.positions = numpy.zeros((capacity,2),dtype=numpy.float32)
+        self.velocities = numpy.zeros((capacity,2),dtype=numpy.float32)
+        self.lifetimes = numpy.zeros(capacity,dtype=numpy.float32)
+        self.colors = numpy.zeros(capacity,dtype=numpy.uint8)
+        self._random = numpy.random.default_rng()
+
+        self.textures = []
+        self.set_palette([[255,255,255]])
+
+    def set_palette(self,colors:list[list[int,int,int]]) -> None:
+
+        """
+        Sets the colors particles can use, every color is pre rendered as texture.
+
+        Args:
+
+        - colors (list[list[int,int,int]]): Colors, emit picks them by index.
+
+        Example:
+        ```
+        self.particles.set_palette([[255,255,255],[180,180,180],[255,200,80]])
+        ```
+        """
+
+        self.textures = []
+        for color in colors[:256]:
+            texture = pygame.Surface((self.size,self.size))
+            if pygame.display.get_surface() != None:
+                texture = texture.convert()
+            texture.fill(color)
+            self.textures.append(texture)
+        self.engine.window.register_surface(self,"textures")
+
+    def emit(self,x:float,y:float,count:int=10,speed:float=200.0,angle:float=-90.0,spread:float=360.0,lifetime:float=1.0,color:int=0) -> int:
+
+        """
+        Spawns particles at a position, particles over capacity are not spawned.
+
+        Args:
+
+        - x (float): X position in world space.
+        - y (float): Y position in world space.
+        - count (int)=10: Number of particles.
+        - speed (float)=200.0: Maximum starting speed in pixels per second.
+        - angle (float)=-90.0: Direction in degrees, -90 is up.
+        - spread (float)=360.0: Angle in degrees the directions are spread over.
+        - lifetime (float)=1.0: Maximum seconds a particle lives.
+        - color (int)=0: Palette index of the particles.
+
+        Returns:
+
+        - Number of spawned particles.
+
+        Example:
+        ```
+        self.particles.emit(self.player.x,self.player.y,20,speed=150,spread=90)
+        ```
+        """
+
+        count = min(count,self.capacity-self.count)
+        if count <= 0:
+            return 0
+
+        # Random directions, speeds and lifetimes for all new particles at once
+        start = self.count
+        end = start+count
+        angles = numpy.radians(angle+(self._random.random(count,dtype=numpy.float32)-0.5)*spread)
+        speeds = speed*(0.5+0.5*self._random.random(count,dtype=numpy.float32))
+        self.positions[start:end] = (x,y)
+        self.velocities[start:end,0] = numpy.cos(angles)*speeds
+        self.velocities[start:end,1] = numpy.sin(angles)*speeds
+        self.lifetimes[start:end] = lifetime*(0.5+0.5*self._random.random(count,dtype=numpy.float32))
+        self.colors[start:end] = min(max(color,0),len(self.textures)-1)
+        self.count = end
+        return count
+
+    def clear(self) -> None:
+
+        """
+        Removes all particles.
+        """
+
+        self.count = 0
+
+    def update(self) -> None:
+
+        """
+        Moves all particles, bounces them off solid tiles and removes dead particles.
+        """
+
+        if self.count == 0:
+            return
+
+        delta_time = self.engine.delta_time
+        positions = self.positions[:self.count]
+        velocities = self.velocities[:self.count]
+        velocities[:,1] += self.gravity*delta_time
+        new_positions = positions+velocities*delta_time
+
+        # Test each axis against the solid tile mask and bounce instead of moving into a tile
+        if self.tilemap != None:
+            mask = self.tilemap.get_solid_mask()
+            if mask.size > 0:
+                tile_size = self.tilemap.tile_size
+                hit_x = self._is_solid(mask,tile_size,new_positions[:,0],positions[:,1])
+                hit_y = self._is_solid(mask,tile_size,positions[:,0],new_positions[:,1])
+                hit_y |= ~hit_x & self._is_solid(mask,tile_size,new_positions[:,0],new_positions[:,1])
+                new_positions[hit_x,0] = positions[hit_x,0]
+                velocities[hit_x,0] *= -self.bounce
+                new_positions[hit_y,1] = positions[hit_y,1]
+                velocities[hit_y,1] *= -self.bounce
+                velocities[hit_y,0] *= self.friction
+        positions[:] = new_positions
+
+        # Move living particles to the front
+        self.lifetimes[:self.count] -= delta_time
+        alive = self.lifetimes[:self.count] > 0
+        alive_count = int(numpy.count_nonzero(alive))
+        if alive_count != self.count:
+            self.positions[:alive_count] = positions[alive]
+            self.velocities[:alive_count] = velocities[alive]
+            self.lifetimes[:alive_count] = self.lifetimes[:self.count][alive]
+            self.colors[:alive_count] = self.colors[:self.count][alive]
+            self.count = alive_count
+
+    def _is_solid(self,mask:numpy.ndarray,tile_size:int,xs:numpy.ndarray,ys:numpy.ndarray) -> numpy.ndarray:
+
+        # Tiles outside of the tilemap are empty
+        tile_x = numpy.floor_divide(xs,tile_size).astype(numpy.int32)
+        tile_y = numpy.floor_divide(ys,tile_size).astype(numpy.int32)
+        inside = (tile_x >= 0) & (tile_x < mask.shape[1]) & (tile_y >= 0) & (tile_y < mask.shape[0])
+        solid = numpy.zeros(len(xs),dtype=bool)
+        solid[inside] = mask[tile_y[inside],tile_x[inside]]
+        return solid
+
+    def draw(self) -> None:
+
+        """
+        Draws all particles inside the camera view with one blit call per palette color.
+        """
+
+        if self.count == 0:
+            return
+
+        # Screen positions of particles inside the view
+        width,height = self.engine.window.get_logical_size()
+        screen = (self.positions[:self.count]+(self.camera.x,self.camera.y)).astype(numpy.int32)
+        visible = (screen[:,0] > -self.size) & (screen[:,0] < width) & (screen[:,1] > -self.size) & (screen[:,1] < height)
+        screen = screen[visible]
+        colors = self.colors[:self.count][visible]
+
+        # Lazy pairs of plain ints are much cheaper to build than a nested list
+        if len(self.textures) == 1:
+            self.engine.window.render_batch(self.textures[0],zip(screen[:,0].tolist(),screen[:,1].tolist()),self.layer)
+            return
+        for index,texture in enumerate(self.textures):
+            selected = screen[colors == index]
+            if len(selected) > 0:
+                self.engine.window.render_batch(texture,zip(selected[:,0].tolist(),selected[:,1].tolist()),self.layer)
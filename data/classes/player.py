@@ -3,25 +3,31 @@ import json
 import numpy
 import pygame
 from data.classes.camera import Camera
+from data.classes.animation import Animation
 
 class Player:
-    def __init__(self,engine,x=0.0,y=0.0,camera:Camera=None) -> None:
+    def __init__(self,engine,x=0.0,y=0.0,camera:Camera=None,tilemap=None) -> None:
         self.engine = engine
         self.x = x
         self.y = y
         self.vel_x = 0.0
         self.vel_y = 0.0
 
-        self.coyote_time = 0.0
-        self.jump_buffer = 0.0
+        self.coyote_timer = None
+        self.jump_buffer_timer = None
         self.stop = 1
         self.on_floor = False
 
         self.sprites = []
+        self.animation = None
 
         self.camera = camera
         if camera == None:
             self.camera = Camera(self.engine)
+        self.tilemap = tilemap
+        if tilemap == None:
+            self.tilemap = self.engine.tilemap
+        self.particles = None
 
         self.JUMP_BUTTON = "accept"
         self.LEFT_BUTTON = "left"
@@ -62,19 +68,19 @@ class Player:
                 self.MAX_JUMP_BUFFER = data["jump_buffer"]
             if "size" in data:
                 self.SIZE = data["size"]
+            self.animation = Animation(self.engine,(self.SIZE,self.SIZE))
             if "sprites" in data:
                 if type(data["sprites"]) == list:
-                    for path in data["sprites"]:
-                        self.sprites.append(pygame.transform.scale(pygame.image.load(path),(self.SIZE,self.SIZE)))
+                    self.animation.add("idle",data["sprites"])
+                    self.sprites = list(self.animation.animations["idle"][0])
+                    self.engine.window.register_surface(self,"sprites")
+            if "animations" in data:
+                for name in data["animations"]:
+                    animation = data["animations"][name]
+                    self.animation.add(name,animation["path"],animation.get("frame_width"),animation.get("frame_height"),animation.get("frame_time",0.1),animation.get("loop",True))
 
     def update(self):
-        collision_rects = self.engine.tilemap.get_collisions(self,1)
-        
-        if self.coyote_time > 0:
-            self.coyote_time = max(self.coyote_time-self.engine.delta_time,0)
-
-        if self.jump_buffer > 0:
-            self.jump_buffer = max(self.jump_buffer-self.engine.delta_time,0)
+        collision_rects = self.tilemap.get_collisions(self,1)
 
         # Gravity
 
@@ -84,12 +90,13 @@ class Player:
         # Jumping
 
         if self.engine.input.get(self.JUMP_BUTTON):
-            if self.coyote_time > 0 or self.on_floor:
+            if self.engine.timers.is_active(self.coyote_timer) or self.on_floor:
                 self.vel_y = -self.JUMP_STRENGTH
                 self.on_floor = False
-                self.coyote_time = 0
+                self.engine.timers.cancel(self.coyote_timer)
             else:
-                self.jump_buffer = self.MAX_JUMP_BUFFER
+                self.engine.timers.cancel(self.jump_buffer_timer)
+                self.jump_buffer_timer = self.engine.timers.after(self.MAX_JUMP_BUFFER)
 
         # Movement
 
@@ -107,31 +114,50 @@ class Player:
             player_rect = pygame.FRect(self.x,self.y,self.SIZE,self.SIZE)
             if player_rect.colliderect(rect):
                 if self.vel_x > 0:
-                    self.x = rect.left - self.engine.tilemap.tile_size
+                    self.x = rect.left - self.tilemap.tile_size
                     self.vel_x = 0
                 elif self.vel_x < 0:
                     self.x = rect.right
                     self.vel_x = 0
 
+        was_on_floor = self.on_floor
         self.y += self.vel_y*self.engine.delta_time
         for rect in collision_rects:
             player_rect = pygame.FRect(self.x,self.y,self.SIZE,self.SIZE)
             if player_rect.colliderect(rect):
                 if self.vel_y > 0:
-                    self.y = rect.top - self.engine.tilemap.tile_size
+                    self.y = rect.top - self.tilemap.tile_size
                     self.vel_y = 0
                     self.on_floor = True
-                    self.coyote_time = 0
-                    if self.jump_buffer > 0:
+                    self.engine.timers.cancel(self.coyote_timer)
+                    if self.engine.timers.is_active(self.jump_buffer_timer):
                         self.vel_y = -self.JUMP_STRENGTH
-                    self.jump_buffer = 0.0
+                    self.engine.timers.cancel(self.jump_buffer_timer)
                 elif self.vel_y < 0:
                     self.y = rect.bottom
                     self.vel_y = 0
 
+        # Landing dust, one pixel above the floor so it does not start inside the solid tile
+        if self.on_floor and not was_on_floor and self.particles != None:
+            self.particles.emit(self.x+self.SIZE/2,self.y+self.SIZE-1,12,speed=120,spread=120,lifetime=0.4,color=1)
+
         if self.on_floor and self.vel_y != 0:
             self.on_floor = False
-            self.coyote_time = self.MAX_COYOTE_TIME
+            self.coyote_timer = self.engine.timers.after(self.MAX_COYOTE_TIME)
+
+        # Animation
+
+        if self.vel_x != 0:
+            self.animation.flipped = self.vel_x < 0
+        state = "idle"
+        if not self.on_floor:
+            state = "jump" if self.vel_y < 0 else "fall"
+        elif self.vel_x != 0:
+            state = "run"
+        if not self.animation.has(state):
+            state = "idle"
+        self.animation.play(state)
+        self.animation.update()
     
     def draw(self):
-        self.engine.window.render(self.sprites[0],(self.x+self.camera.x,self.y+self.camera.y))
\ No newline at end of file
+        self.engine.window.submit(self.animation.get_sprite(),(self.x+self.camera.x,self.y+self.camera.y),layer=1)
\ No newline at end of file
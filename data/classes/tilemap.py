@@ -1,21 +1,28 @@
 import os
 import json
+import numpy
 import pygame
 from data.classes.player import Player
 from data.classes.camera import Camera
+from frostlight_engine import profile
 
 class Tilemap:
-    def __init__(self,engine,camera:Camera=None) -> None:
+    def __init__(self,engine,camera:Camera=None,images:dict=None,layer:int=None) -> None:
         self.engine = engine
+        self.images = images if images != None else {}
+        self.layer = layer
         self.tile_size = 0
         self.width = 0
         self.height = 0
         self.tilemap = []
         self.tile_sprites = {}
+        self.solid_mask = None
         self.sprite = pygame.Surface((self.width*self.tile_size,self.height*self.tile_size)).convert_alpha()
         self.camera = camera
         if camera == None:
             self.camera = Camera(self.engine)
+        self.engine.window.register_surface(self,"sprite")
+        self.engine.window.register_surface(self,"tile_sprites")
 
         self.load_config()
 
@@ -28,16 +35,19 @@ class Tilemap:
                 if type(data["width"]) == int:
                     self.width = data["width"]
                 elif data["width"] == "screen":
-                    self.width = int(1920/self.tile_size)
+                    self.width = int(self.engine.window.get_logical_size()[0]/self.tile_size)
             if "height" in data:
                 if type(data["height"]) == int:
                     self.height = data["height"]
                 elif data["height"] == "screen":
-                    self.height = int(1080/self.tile_size)
+                    self.height = int(self.engine.window.get_logical_size()[1]/self.tile_size)
             if "sprites" in data:
                 for tile in data["sprites"]:
                     if type(data["sprites"][tile]) == str:
-                        self.tile_sprites[tile] = pygame.transform.scale(pygame.image.load(data["sprites"][tile]),(self.tile_size,self.tile_size)).convert_alpha()
+                        # Images preloaded by a scene are used instead of loading them again
+                        path = data["sprites"][tile]
+                        image = self.images[path] if path in self.images else pygame.image.load(path)
+                        self.tile_sprites[tile] = pygame.transform.scale(image,(self.tile_size,self.tile_size)).convert_alpha()
 
     def load_tilemap(self,file:str):
         tilemap = []
@@ -55,6 +65,7 @@ class Tilemap:
                 if tile != None:
                     self.sprite.blit(self.tile_sprites[tile],(x*self.tile_size,y*self.tile_size))
             self.tilemap.append(layer)
+        self.solid_mask = None
         self.camera.center_rect(pygame.Rect(0,0,self.width*self.tile_size,self.height*self.tile_size))
 
     def save_tilemap(self,file:str):
@@ -74,6 +85,7 @@ class Tilemap:
             for x in range(width):
                 layer.append(None)
             self.tilemap.append(layer)
+        self.solid_mask = None
 
     def set_tile(self,x,y,tile):
         if self.tilemap[y][x] != tile:
@@ -81,11 +93,22 @@ class Tilemap:
             self.sprite.set_colorkey((0,0,0))
             self.sprite = pygame.transform.scale(self.sprite,(self.width*self.tile_size,self.height*self.tile_size)).convert_alpha()
             self.tilemap[y][x] = tile
+            self.solid_mask = None
             for y,layer in enumerate(self.tilemap):
                 for x,tile in enumerate(layer):
                     if tile != None:
                         self.sprite.blit(self.tile_sprites[tile],(x*self.tile_size,y*self.tile_size))
 
+    def get_solid_mask(self) -> numpy.ndarray:
+
+        # Boolean array [y,x] of solid tiles, rebuilt only after the tilemap changed
+        if self.solid_mask is None:
+            self.solid_mask = numpy.zeros((self.height,self.width),dtype=bool)
+            for y,layer in enumerate(self.tilemap[:self.height]):
+                for x,tile in enumerate(layer[:self.width]):
+                    self.solid_mask[y,x] = tile != None
+        return self.solid_mask
+
     def get_collisions(self,player:Player,radius):
         mx = int(min(max(divmod(player.x+player.SIZE/2,self.tile_size)[0],0),self.width-1))
         my = int(min(max(divmod(player.y+player.SIZE/2,self.tile_size)[0],0),self.height-1))
@@ -104,6 +127,14 @@ class Tilemap:
     def update(self):
         pass
 
+    @profile("tilemap.draw")
     def draw(self):
-        self.engine.window.render(self.sprite,(0+self.camera.x,0+self.camera.y))
+
+        # Only render the part of the tilemap inside the camera view
+        area = self.camera.get_view_rect().clip(self.sprite.get_rect())
+        if area.width > 0 and area.height > 0:
+            if self.layer == None:
+                self.engine.window.render(self.sprite,(area.x+self.camera.x,area.y+self.camera.y),area)
+            else:
+                self.engine.window.submit(self.sprite.subsurface(area),(area.x+self.camera.x,area.y+self.camera.y),self.layer)
         
\ No newline at end of file
@@ -5,13 +5,13 @@ from data.classes.camera import Camera
 
 class Game(Engine):
     def __init__(self):
-        super().__init__(catch_error=False,delete_old_logs=True) # Engine options go here
+        super().__init__(catch_error=False,delete_old_logs=True,fps=60) # Engine options go here
         self.tilemap = Tilemap(self)
         self.tilemap.load_tilemap(os.path.join("data","tilemap.json"))
         self.input.new("place",MOUSE_LEFTCLICK,PRESSED)
         self.input.new("delete",MOUSE_RIGHTCLICK,PRESSED)
         self.input.new("up",KEY_ARROW_UP,PRESSED)
-        self.input.new("down",KEY_ARROW_UP,PRESSED)
+        self.input.new("down",KEY_ARROW_DOWN,PRESSED)
         self.input.new("grid",KEY_G,CLICKED)
         self.input.new("quit",KEY_ESCAPE,PRESSED)
         self.grid = True
@@ -25,7 +25,6 @@ class Game(Engine):
         self.tilemap.save_tilemap(os.path.join("data","tilemap.json"))
 
     def update(self):
-        self.window.set_name(self.window.get_fps())
         if self.input.get("place"):
             for y in range(self.tilemap.height):
                 for x in range(self.tilemap.width):
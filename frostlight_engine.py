@@ -1,12 +1,30 @@
 import os
 import sys
+import math
 import time
 import json
 import glob
+import zlib
+import array
+import heapq
+import queue
+import struct
+import pstats
 import shutil
 import pygame
+import weakref
 import datetime
 import argparse
+import cProfile
+import functools
+import itertools
+import threading
+import traceback
+import contextlib
+import subprocess
+import collections
+import tracemalloc
+import concurrent.futures
 from cryptography.fernet import Fernet
 
 class Builder:
@@ -608,7 +626,7 @@ class Input:
         self._engine = engine
 
         # Mouse variables        
-        self.mouse = self._Mouse()
+        self.mouse = self._Mouse(engine)
 
         # Keyboard variables
         self._keys = {}
@@ -619,6 +637,12 @@ class Input:
         self._joystick_devices = []
         self._reset_joy = []
 
+        # Action values of all devices, per controller and of keyboard and mouse alone, resolved again after input changed
+        self._actions = {}
+        self._controller_actions = []
+        self._keyboard_actions = {}
+        self._dirty = True
+
         # Input variables
         self.autosave = True
         self.save_path = os.path.join("data","saves","input")
@@ -629,7 +653,9 @@ class Input:
             "left":[[KEY_A,PRESSED],[KEY_J,PRESSED],[KEY_ARROW_LEFT,PRESSED],[JOYSTICK_DPAD_LEFT,PRESSED],[JOYSTICK_LEFT_STICK_LEFT,PRESSED],[JOYSTICK_RIGHT_STICK_LEFT,PRESSED]],
             "up":[[KEY_W,PRESSED],[KEY_I,PRESSED],[KEY_ARROW_UP,PRESSED],[JOYSTICK_DPAD_UP,PRESSED],[JOYSTICK_LEFT_STICK_UP,PRESSED],[JOYSTICK_RIGHT_STICK_UP,PRESSED]],
             "down":[[KEY_S,PRESSED],[KEY_K,PRESSED],[KEY_ARROW_DOWN,PRESSED],[JOYSTICK_DPAD_DOWN,PRESSED],[JOYSTICK_LEFT_STICK_DOWN,PRESSED],[JOYSTICK_RIGHT_STICK_DOWN,PRESSED]],
-            "screenshot":[[KEY_P,CLICKED],[KEY_F6,CLICKED]]
+            "screenshot":[[KEY_P,CLICKED],[KEY_F6,CLICKED]],
+            "debug":[[KEY_F3,CLICKED]],
+            "profile":[[KEY_F9,CLICKED]]
         }
 
         # Setting default value for keys
@@ -638,6 +664,15 @@ class Input:
                 if key[0][1] == _KEYBOARD:
                     self._keys[key[0][0]] = [False,False,False]
 
+        # Saved inputs are read once, default inputs missing in the file are kept
+        self._save_pending = False
+        self._saving = False
+        default_input = self._registered_input
+        if os.path.exists(self.save_path) and self.load():
+            for name in default_input:
+                if name not in self._registered_input:
+                    self._registered_input[name] = default_input[name]
+
     def new(self, name:str, key:list[int,int], method:int=1) -> bool:
 
         """
@@ -652,7 +687,7 @@ class Input:
         - True if registration was successful.
         - False if input is already registered or something went wrong.
 
-        If the variable autosave is True the new input is automatically saved and loaded.
+        If the variable autosave is True the inputs are saved on a worker thread at the end of the frame.
 
         Example:
         ```
@@ -665,15 +700,15 @@ class Input:
             if name not in self._registered_input:
                 self._registered_input[name] = [[key,method]]
             else:
-                if [key,method] not in self.registered_input[name]:
+                if [key,method] not in self._registered_input[name]:
                     self._registered_input[name].append([key,method])
                 else:
                     return False
 
             self._keys[key[0]] = [False,False,False]
+            self._dirty = True
             if self.autosave:
-                self.save()
-                self.load()
+                self._save_pending = True
             return True
         except:
             return False
@@ -691,7 +726,7 @@ class Input:
         - True if removal was successful.
         - False if something went wrong.
 
-        If the variable autosave is True the removal of the input is automatically saved.
+        If the variable autosave is True the inputs are saved on a worker thread at the end of the frame.
 
         Example:
 
@@ -701,18 +736,18 @@ class Input:
         registered inputs 
 
         - before removal:
-        {"accept","cancel","right","left","up","down","screenshot","move_left"}
+        {"accept","cancel","right","left","up","down","screenshot","debug","move_left"}
 
         - after removal:
-        {"accept","cancel","right","left","up","down","screenshot"}
+        {"accept","cancel","right","left","up","down","screenshot","debug"}
         """
 
         # Remove registered input
         try:
             del self._registered_input[inputname]
+            self._dirty = True
             if self.autosave:
-                self.save()
-                self.load()
+                self._save_pending = True
             return True
         except:
             return False
@@ -742,7 +777,7 @@ class Input:
         """
 
         # Resets value of registered input to default
-
+        self._dirty = True
         try:
             for key in self._registered_input[name]:
                 if key[0][1] == _KEYBOARD:
@@ -782,7 +817,11 @@ class Input:
         Returns:
         - Axis return value between -1.0 and 1.0.
         - Keys and buttons return either 0 or 1.
-        - If return is 0 either the inputname or joystick dose not exist or input is on default value.
+        - If return is 0 either the inputname does not exist or input is on default value.
+        - Keyboard and mouse count for every controller, also for controllers that are not connected.
+
+        All actions are resolved at once on the first call after the input changed,
+        so calling get many times per frame is a dictionary lookup.
 
         Example:
 
@@ -792,44 +831,61 @@ class Input:
         ```
         """
 
-        # Get input value from registered input
-        try:
-            for key in self._registered_input[name]:
-
-                # Keyboard values
-                if key[0][1] == _KEYBOARD:
-                    if self._keys[key[0][0]][key[1]]:
-                        return 1
-
-                # Mouse values
-                elif key[0][1] == _MOUSE:
-                    if self.mouse.buttons[key[0][0]][key[1]]:
-                        return 1
+        if self._dirty:
+            self._resolve()
+
+        # Get input value from resolved actions
+        if controller_index == -1:
+            return self._actions.get(name,0)
+        if 0 <= controller_index < len(self._controller_actions):
+            return self._controller_actions[controller_index].get(name,0)
+        return self._keyboard_actions.get(name,0)
+
+    def _resolve(self) -> None:
+
+        # The first binding with a value other than 0 wins, keyboard and mouse count for every controller
+        devices = self._joystick_devices
+        actions = {}
+        controller_actions = [{} for _ in devices]
+        keyboard_actions = {}
+        for name,bindings in self._registered_input.items():
+            value = 0
+            keyboard_value = 0
+            controller_values = [0]*len(devices)
+            for key,method in bindings:
 
                 # Joystick values
-                elif key[0][1] == _JOYSTICK:
-                    if controller_index == -1:
-
-                        # Get value from not specified joystick
-                        for i in range(len(self._joystick_devices)):
-                            input_value = self._joystick_devices[i]._get_input(key[0][0],key[1])
-                            if input_value != False or input_value != 0.0:
-                                return input_value
-                    else:
-
-                        # Get value from specified joystick
-                        if controller_index < len(self._joystick_devices):
-                            input_value = self._joystick_devices[controller_index]._get_input(key[0][0],key[1])
-                        else:
-                            return 0
-
-                        # Filter joystick input value
-                        if input_value != False or input_value != 0.0:
-                            return input_value
-        except:
-            return 0
-
-        return 0
+                if key[1] == _JOYSTICK:
+                    for index,device in enumerate(devices):
+                        input_value = device._get_input(key[0],method)
+                        if input_value:
+                            if type(input_value) == bool:
+                                input_value = 1
+                            if value == 0:
+                                value = input_value
+                            if controller_values[index] == 0:
+                                controller_values[index] = input_value
+                    continue
+
+                # Keyboard and mouse values
+                if key[1] == _KEYBOARD:
+                    state = self._keys.get(key[0])
+                else:
+                    state = self.mouse.buttons[key[0]] if key[0] < len(self.mouse.buttons) else None
+                if state != None and state[method]:
+                    value = value or 1
+                    keyboard_value = 1
+                    controller_values = [controller_value or 1 for controller_value in controller_values]
+
+            actions[name] = value
+            keyboard_actions[name] = keyboard_value
+            for index,controller_value in enumerate(controller_values):
+                controller_actions[index][name] = controller_value
+
+        self._actions = actions
+        self._controller_actions = controller_actions
+        self._keyboard_actions = keyboard_actions
+        self._dirty = False
     
     def set(self, name:str, keys:list[int,int]):
 
@@ -845,7 +901,7 @@ class Input:
         - True if registration was successful.
         - False if something went wrong.
 
-        If the variable autosave is True the new input is automatically saved and loaded.
+        If the variable autosave is True the inputs are saved on a worker thread at the end of the frame.
 
         Example:
         ```
@@ -855,14 +911,14 @@ class Input:
 
         # Sets key to new inputs
         try:
-            self._registered_input[name] = key
+            self._registered_input[name] = keys
             for key in self._registered_input[name]:
                 if key[0][1] == _KEYBOARD:
                     self._keys[key[0][0]] = [False,False,False]
+            self._dirty = True
 
             if self.autosave:
-                self.save()
-                self.load()
+                self._save_pending = True
 
             return True
         except:
@@ -871,7 +927,9 @@ class Input:
     def save(self):
 
         """
-        Saves registered inputs to file.
+        Saves registered inputs to file right away.
+
+        The file is written next to the old one and then replaces it, so it is never left half written.
 
         Args:
         - no args are required.
@@ -888,8 +946,8 @@ class Input:
 
         # Save registered input in file
         try:
-            with open(self.save_path,"w+") as f:
-                json.dump(self._registered_input,f)
+            self._write(json.dumps(self._registered_input))
+            self._save_pending = False
             return True
         except:
             return False
@@ -899,6 +957,8 @@ class Input:
         """
         Load registered inputs from file.
 
+        Saved inputs are loaded when the engine starts, so this is only needed to undo unsaved changes.
+
         Args:
         - no args are required.
 
@@ -914,21 +974,110 @@ class Input:
 
         # Load registered input in file
         try:
-            with open(self.save_path,"r+") as f:
-                self._registered_input = json.load(f)
-
-                # Setting default value for keys
-                for i in self._registered_input:
-                    for key in self._registered_input[i]:
-                        if key[0][1] == _KEYBOARD:
-                            self._keys[key[0][0]] = [False,False,False]
-            return True
+            with open(self.save_path,"r") as f:
+                data = json.load(f)
         except:
             return False
+        if type(data) != dict:
+            self._engine.logger.warning(f"Could not load inputs, {self.save_path} does not contain inputs")
+            return False
+
+        # Invalid bindings of a broken or edited file are skipped, inputs without valid bindings keep their default
+        registered_input = {}
+        for name,bindings in data.items():
+            valid_bindings = [binding for binding in bindings if self._is_valid_binding(binding)] if type(bindings) == list else []
+            if type(bindings) != list or len(valid_bindings) != len(bindings):
+                self._engine.logger.warning(f"Skipped invalid bindings of input {name} in {self.save_path}")
+            if valid_bindings:
+                registered_input[name] = valid_bindings
+        self._registered_input = registered_input
+        self._dirty = True
+        self._save_pending = False
+
+        # Setting default value for keys
+        for i in self._registered_input:
+            for key in self._registered_input[i]:
+                if key[0][1] == _KEYBOARD:
+                    self._keys[key[0][0]] = [False,False,False]
+        return True
+
+    def _is_valid_binding(self,binding) -> bool:
+
+        # A binding is [[key,device],method] with a known device and method
+        try:
+            [key,device],method = binding
+        except (TypeError,ValueError):
+            return False
+        if type(key) != int or type(method) != int or method not in [CLICKED,PRESSED,RELEASE]:
+            return False
+        if device == _KEYBOARD:
+            return True
+        if device == _MOUSE:
+            return 0 <= key < len(self.mouse.buttons)
+        if device == _JOYSTICK:
+            return 0 <= key <= JOYSTICK_RIGHT_STICK_RIGHT[0]
+        return False
+
+    def _write(self,text:str) -> None:
+
+        # Write a temporary file per thread and swap it in
+        folder = os.path.dirname(self.save_path)
+        if folder != "" and not os.path.exists(folder):
+            os.makedirs(folder)
+        temporary_path = f"{self.save_path}.{threading.get_ident()}.tmp"
+        with open(temporary_path,"w") as f:
+            f.write(text)
+        os.replace(temporary_path,self.save_path)
+
+    def _saved(self,result=None) -> None:
+
+        # Next save can start
+        self._saving = False
+
+    def _save_failed(self,error:Exception) -> None:
+
+        # Logged once, the next change tries again
+        self._saving = False
+        self._engine.logger.warning(f"Could not save inputs ({error})")
+
+    def _flush(self) -> None:
+
+        """
+        Saves changed inputs on a worker thread once per frame.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Changes during a running save are saved next frame
+        if not self._save_pending or self._saving:
+            return
+        self._save_pending = False
+        self._saving = True
+        self._engine.jobs.submit(self._write,json.dumps(self._registered_input),callback=self._saved,error_callback=self._save_failed)
+
+    def _stop(self) -> None:
+
+        """
+        Saves changed inputs before the game closes.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if self._save_pending:
+            self.save()
 
     def _update(self) -> None:
 
         # Update all input devices
+        self._dirty = True
         for key in self._reset_keys.copy():
             self._keys[key][0] = False
             self._keys[key][2] = False
@@ -941,6 +1090,7 @@ class Input:
             self._reset_joy.remove(joystick)
 
     def _handle_key_event(self, event:pygame.Event):
+        self._dirty = True
 
         # Handel joystick button down event
         if event.type == pygame.KEYDOWN:
@@ -953,6 +1103,8 @@ class Input:
             self._reset_keys.append(event.key)
 
     def _handle_mouse_event(self, event:pygame.Event):
+        self._dirty = True
+
         # Handel joystick button down event
         if event.type == pygame.MOUSEBUTTONDOWN:
             self.mouse.buttons[event.button-1] = [True,True,False]
@@ -962,6 +1114,7 @@ class Input:
             self.mouse.buttons[event.button-1] = [False,False,True]
 
     def _handle_joy_event(self, event:pygame.Event):
+        self._dirty = True
 
         # joystick specification
         joy_index = event.joy
@@ -1037,12 +1190,17 @@ class Input:
     def _init_joysticks(self) -> None:
 
         # Creates joystick device to be used
+        self._dirty = True
         self._joystick_devices = []
+
         for joystick in range(pygame.joystick.get_count()):
             self._joystick_devices.append(self._Joystick(pygame.joystick.Joystick(joystick)))
 
     class _Mouse:
-        def __init__(self) -> None:
+        def __init__(self,engine) -> None:
+
+            # Engine variable
+            self._engine = engine
 
             # Mouse variables
             self.position = [0,0]
@@ -1065,7 +1223,7 @@ class Input:
             self.buttons[2][2] = False
 
             # Get mouse values
-            self.position = [pygame.mouse.get_pos()[0],pygame.mouse.get_pos()[1]]
+            self.position = self._engine.window.map_position(pygame.mouse.get_pos())
             mouse_pressed = pygame.mouse.get_pressed()
             self.buttons[0][1] = mouse_pressed[0]
             self.buttons[1][1] = mouse_pressed[1]
@@ -1074,7 +1232,7 @@ class Input:
         def get_pos(self) -> list[int,int]:
 
             """
-            Returns mouse position relative to main window.
+            Returns mouse position relative to main window in logical resolution.
 
             Args:
             - no args are required.
@@ -1240,7 +1398,7 @@ class Logger:
 
         Args:
 
-        - message (str): Content to log.
+        - message (str | Exception): Content to log, exceptions passed outside of an except block are logged with their traceback.
 
         Mostly used by the engine internally but can also be used for logging other error messages
 
@@ -1250,7 +1408,15 @@ class Logger:
         ```
         """
 
+        # Exception caught by a job or another thread keeps its own traceback
         exc_type, exc_obj, exc_tb = sys.exc_info()
+        if exc_tb == None:
+            if isinstance(message,BaseException) and message.__traceback__ != None:
+                self._log("Error","".join(traceback.format_exception(message)).rstrip())
+            else:
+                self._log("Error",str(message))
+            return
+
         fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
         self._log("Error",f"{message} in [{fname} line: {exc_tb.tb_lineno}]")
 
@@ -1500,236 +1666,372 @@ class SaveManager():
             os.path.join(backup_path,f'{os.path.split(self.path)[-1]}-{datetime.datetime.now().strftime("%d.%m.%y %H-%M-%S")}')
             )
 
-class Window:
-    def __init__(self,engine,set_window_size=None,fullscreen=False,resizable=True,windowless=False,window_centered=True,vsync=False,window_name="Frostlight Engine",mouse_visible=True,color_depth=24) -> None:
+class Screenshot:
+    def __init__(self,engine,path:str="screenshots",queue_size:int=8) -> None:
 
         """
-        Initialise the engines window system.
+        Initialise the engines screenshot system.
 
-        The window system manages all window events and rendering.
+        The screenshot system copies frames into reused surfaces on the main thread,
+        converting and encoding them as png happens on a worker thread.
 
         Args:
 
         - engine (Engine): The engine to access specific variables.
-        - set_window_size (list)=None: Size of window.
-        - fullscreen (bool)=False: Sets windows fullscreen mode.
-        - resizable (bool)=True: Sets windows resizability.
-        - windowless (bool)=False: Removes window interaction menu at the top.
-        - window_centered (bool)=True: Sets window centered state.
-        - vsync (bool)=False: Sets vsync state.
-        - window_name (str)="Frostlight Engine": Default name to display.
-        - mouse_visible (bool)=True: mouses visibility state.
-        - color_depth (int)=24: Window color depth.
+        - path (str)="screenshots": Folder screenshots are saved to.
+        - queue_size (int)=8: Frames waiting to be written before new frames are dropped.
 
         !!!This is only used internally by the engine and should not be called in a game!!!
         """
 
-        # Engine Variable
+        # Engine variable
         self.engine = engine
 
-        # Setting startup variables
-        self.windowless = windowless
-        self.window_centered = window_centered
-        self.vsync = vsync
-        self.color_depth = color_depth
-        self.fullscreen = fullscreen
-        self.window_name = window_name
-        self.mouse_visible = mouse_visible
-        self.window_size = set_window_size
-        self.resizable = resizable
+        # Setting starting variables
+        self.path = path
+        self.saved = 0
+        self.dropped = 0
+        self._frames_to_capture = 0
+        self._queue = queue.Queue(queue_size)
+        self._thread = None
 
-    def _create(self):
+        # Copy surfaces handed back by the writer, at most one per queued frame
+        self._queue_size = queue_size
+        self._buffers = 0
+        self._free = queue.SimpleQueue()
+
+    def take(self) -> None:
 
         """
-        Creates main window instance.
+        Takes a screenshot of the current frame after it is drawn.
 
         Args:
 
         - no args are required.
 
-        !!!This is only used internally by the engine and should not be called in a game!!!
+        Example:
+        ```
+        self.screenshot.take()
+        ```
         """
 
-        if not self.windowless:
-            pygame.display.init()
+        # Capture at least the current frame
+        self._frames_to_capture = max(self._frames_to_capture,1)
 
-            # Center window
-            if self.window_centered:
-                os.environ['SDL_VIDEO_CENTERED'] = '1'
-            else:
-                os.environ['SDL_VIDEO_CENTERED'] = '0'
+    def burst(self,frames:int) -> None:
 
-            # Create window
-            display_size = [int(pygame.display.Info().current_w),int(pygame.display.Info().current_h)]
-            if self.fullscreen: 
+        """
+        Takes screenshots of several consecutive frames.
 
-                # Fullscreen window
-                self.main_surface = pygame.display.set_mode(display_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.FULLSCREEN,vsync=self.vsync,depth=self.color_depth)
-            else:
+        Frames are dropped instead of waiting if the writer falls behind.
 
-                # Calculate fitting window size
-                if self.window_size == None:
-                    self.window_size = [display_size[0],display_size[1]*0.94]
+        Args:
 
-                if self.resizable:
+        - frames (int): Number of frames to capture.
 
-                    # Resizable window
-                    self.main_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE,vsync=self.vsync,depth=self.color_depth)
-                else: 
+        Example:
+        ```
+        self.screenshot.burst(30)
+        ```
+        """
 
-                    # Fixed size window
-                    self.main_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.NOFRAME,vsync=self.vsync,depth=self.color_depth)
+        # Capture the next frames
+        self._frames_to_capture = max(self._frames_to_capture,frames)
 
-            # Change window attributes
-            pygame.display.set_caption(self.window_name)
-            pygame.mouse.set_visible(self.mouse_visible)
+    def _update(self) -> None:
+
+        """
+        Copies the current frame if a screenshot was requested.
+
+        Args:
 
-    def render(self,sprite:pygame.Surface,pos:list[int,int] | pygame.Rect):
+        - no args are required.
 
+        !!!This is only used internally by the engine and should not be called in a game!!!
         """
-        Renders a sprite to the main window.
+
+        # Screenshot input action
+        if self.engine.input.get("screenshot"):
+            self.take()
+        if self._frames_to_capture <= 0:
+            return
+        self._frames_to_capture -= 1
+
+        # Start writer thread on first use
+        if self._thread == None:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+            self._thread = threading.Thread(target=self._write,name="Screenshot writer",daemon=True)
+            self._thread.start()
+
+        # Take a free copy surface, frames are dropped instead of waiting for the writer
+        surface = self.engine.window.main_surface
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            if self._buffers >= self._queue_size:
+                self.dropped += 1
+                return
+            self._buffers += 1
+            buffer = pygame.Surface(surface.get_size(),0,surface)
+        if buffer.get_size() != surface.get_size():
+            buffer = pygame.Surface(surface.get_size(),0,surface)
+
+        # Plain memory copy, the writer converts and encodes it
+        buffer.blit(surface,(0,0))
+        self._queue.put_nowait([buffer,datetime.datetime.now()])
+
+    def _write(self) -> None:
+
+        """
+        Encodes and saves queued frames until None is queued.
 
         Args:
 
-        - sprite (pygame.Surface): The sprite to render.
-        - pos (list[int,int]): The position to render the sprite to.
+        - no args are required.
 
-        Example:
-        ```
-        self.window.render(player_sprite,player_pos)
-        ```
+        !!!This is only used internally by the engine and should not be called in a game!!!
         """
 
-        # Renders sprite to main window
-        self.main_surface.blit(sprite,pos)
+        while True:
+            frame = self._queue.get()
+            if frame == None:
+                break
 
-    def resize(self,new_window_size:list[int,int]):
+            # Encode and write png, then hand the surface back for copying
+            buffer,timestamp = frame
+            try:
+                path = os.path.join(self.path,f"{timestamp.strftime('%d.%m.%y %H-%M-%S-%f')}.png")
+                with open(path,"wb") as f:
+                    f.write(self._encode_png(buffer))
+                self.saved += 1
+            except Exception as e:
+                self.engine.jobs.post(self.engine.logger.warning,f"Could not save screenshot ({e})")
+            self._free.put(buffer)
+
+    def _encode_png(self,buffer:pygame.Surface) -> bytes:
 
         """
-        Resizes the main window.
+        Encodes a surface as 24 bit png.
+
+        pygame.image.save keeps the gil while encoding, which stalls the main thread for the whole encode.
+        Rows are converted in small strips and compressed with zlib, which releases the gil,
+        so the main thread only waits for one strip at most.
 
         Args:
 
-        - new_window_size (list[int,int]): The new window size.
+        - buffer (pygame.Surface): Surface to encode.
 
-        Example:
-        ```
-        self.window.resize([600,600])
-        ```
+        Returns:
+
+        - The png file as bytes.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
         """
 
-        # Resize window to specified size        
-        self.window_size = new_window_size
+        # Every row starts with filter type 0
+        width,height = buffer.get_size()
+        stride = width*3
+        compressor = zlib.compressobj(6)
+        data = []
+        for top in range(0,height,32):
+            rows = min(32,height-top)
+            pixels = pygame.image.tobytes(buffer.subsurface((0,top,width,rows)),"RGB")
+            data.append(compressor.compress(b"".join(b"\x00"+pixels[row*stride:(row+1)*stride] for row in range(rows))))
+        data.append(compressor.flush())
 
-        if self.resizable:
+        # Signature and chunks with length and checksum
+        chunks = [[b"IHDR",struct.pack(">IIBBBBB",width,height,8,2,0,0,0)],[b"IDAT",b"".join(data)],[b"IEND",b""]]
+        return b"\x89PNG\r\n\x1a\n"+b"".join(struct.pack(">I",len(body))+kind+body+struct.pack(">I",zlib.crc32(kind+body)) for kind,body in chunks)
 
-            # Resizable window 
-            self.main_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE,vsync=self.vsync,depth=self.color_depth)
-        else: 
+    def _stop(self) -> None:
 
-            # Fixed size window
-            self.main_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.NOFRAME,vsync=self.vsync,depth=self.color_depth)
+        """
+        Writes all queued screenshots and stops the writer thread.
 
-    def set_fullscreen(self,fullscreen:bool):
+        Args:
+
+        - no args are required.
 
+        !!!This is only used internally by the engine and should not be called in a game!!!
         """
-        Changes window fullscreen state.
+
+        if self._thread != None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+class Recorder:
+    def __init__(self,engine,path:str="recordings") -> None:
+
+        """
+        Initialise the engines video recording system.
+
+        Frames are copied into a preallocated ring of surfaces on the main thread,
+        a worker thread writes them as png sequence or pipes them to ffmpeg if it is installed.
 
         Args:
 
-        - fullscreen (bool): Fullscreen state.
+        - engine (Engine): The engine to access specific variables.
+        - path (str)="recordings": Folder recordings are saved to.
 
-        Example:
-        ```
-        self.window.set_fullscreen(True)
-        ```
+        !!!This is only used internally by the engine and should not be called in a game!!!
         """
 
-        # Set fullscreen variable
-        self.fullscreen = fullscreen
-        pygame.display.quit()
-        self._create()
+        # Engine variable
+        self.engine = engine
 
-    def toggle_fullscreen(self):
+        # Setting starting variables
+        self.path = path
+        self.recording = False
+        self.replay = False
+        self.captured = 0
+        self.dropped = 0
+        self.capture_time = 0.0
+
+        # Capture variables
+        self._every = 1
+        self._frame = 0
+        self._buffers = []
+        self._free = queue.Queue()
+        self._filled = queue.Queue()
+        self._thread = None
+
+        # Instant replay variables
+        self._replay_every = 2
+        self._replay_buffers = []
+        self._replay_head = 0
+        self._replay_count = 0
+        self._replay_frame = 0
+        self._replay_saving = False
+
+    def start(self,every:int=1,scale:float=0.5,buffers:int=16,encoder:bool=True) -> bool:
 
         """
-        Toggles window fullscreen state.
+        Starts recording the main window.
+
+        Frames are downscaled by default, a full size copy of a 1920x1080 frame takes about 0.5 to 1.3 ms
+        depending on the machine, which is over the 1 ms capture budget on slower machines.
 
         Args:
 
-        - no args are required.
+        - every (int)=1: Only every nth frame is recorded.
+        - scale (float)=0.5: Scale of the recorded frames relative to the logical resolution, 1.0 records full size.
+        - buffers (int)=16: Frames waiting to be written before new frames are dropped.
+        - encoder (bool)=True: Pipes frames to ffmpeg if installed, otherwise writes a png sequence.
+
+        Returns:
+
+        - True if recording started.
+        - False if already recording.
 
         Example:
         ```
-        self.window.toggle_fullscreen()
+        self.recorder.start(every=2)
         ```
         """
 
-        # Set Fullscreen variable to opposite truth value
-        self.set_fullscreen(not(self.fullscreen))
+        if self.recording:
+            return False
 
-    def set_name(self,name:str="") -> None:
+        # Preallocate frame buffers
+        self._every = max(int(every),1)
+        self._frame = 0
+        self._buffers = self._create_buffers(scale,buffers)
+        self._free = queue.Queue()
+        self._filled = queue.Queue()
+        for index in range(buffers):
+            self._free.put(index)
+
+        # Choose output and start writer thread
+        name = datetime.datetime.now().strftime("%d.%m.%y %H-%M-%S")
+        ffmpeg = shutil.which("ffmpeg") if encoder else None
+        self._thread = threading.Thread(target=self._write,args=[os.path.join(self.path,name),ffmpeg],name="Recorder writer",daemon=True)
+        self._thread.start()
+        self.recording = True
+        self.engine.logger.info(f"Started recording {self._buffers[0].get_width()}x{self._buffers[0].get_height()} every {self._every} frames")
+        return True
+
+    def stop(self) -> None:
 
         """
-        Set a window name.
+        Stops recording and waits until all frames are written.
 
         Args:
 
-        - name (str)="": New window name.
+        - no args are required.
 
         Example:
         ```
-        self.window.set_name("new game")
+        self.recorder.stop()
         ```
         """
 
-        # Renaming the displayed window title
-        pygame.display.set_caption(str(name))
+        if self.recording:
+            self.recording = False
+            self._filled.put(None)
+            self._thread.join()
+            self._thread = None
+            self._buffers = []
+            self.engine.logger.info(f"Stopped recording with {self.captured} frames captured and {self.dropped} dropped")
 
-    def get_fps(self) -> int:
+    def enable_replay(self,seconds:float=10,every:int=3,scale:float=0.25) -> None:
 
         """
-        Returns games fps value.
+        Keeps the last seconds of gameplay in memory to save them later with save_replay.
 
-        Args:
-
-        - no args are required.
+        All frames are preallocated as raw surfaces of width*height*4 bytes, seconds*fps/every of them.
+        At 1920x1080 and 60 fps the defaults keep 200 frames of 480x270 and use about 104 MB,
+        30 seconds of every second frame would already use about 466 MB.
 
-        Returns:
+        Args:
 
-        - FPS value as integer.
+        - seconds (float)=10: Seconds of gameplay to keep.
+        - every (int)=3: Only every nth frame is kept.
+        - scale (float)=0.25: Scale of the kept frames relative to the logical resolution.
 
         Example:
         ```
-        self.window.set_name(self.window.get_fps())
+        self.recorder.enable_replay(10)
         ```
         """
 
-        # Returning frames per second as integer
-        return int(min(self.engine.clock.get_fps(),99999999))
-    
-    def fill(self,color:list[int,int,int]) -> None:
+        # Preallocate replay ring
+        fps = self.engine.fps if self.engine.fps > 0 else 60
+        self._replay_every = max(int(every),1)
+        self._replay_buffers = self._create_buffers(scale,max(int(seconds*fps/self._replay_every),1))
+        self._replay_head = 0
+        self._replay_count = 0
+        self._replay_frame = 0
+        self.replay = True
+        width,height = self._replay_buffers[0].get_size()
+        self.engine.logger.info(f"Replay keeps {len(self._replay_buffers)} frames of {width}x{height} in {len(self._replay_buffers)*width*height*4/1000000:.1f} MB")
+
+    def disable_replay(self) -> None:
 
         """
-        Fills window with a color.
+        Stops keeping gameplay in memory and frees the replay buffers.
 
         Args:
 
-        - color (list[int,int,int]): Color the window is filled with.
+        - no args are required.
 
         Example:
         ```
-        self.window.fill([3,13,36])
+        self.recorder.disable_replay()
         ```
         """
 
-        # Fills the screen with a solid color
-        self.main_surface.fill(color)
-    
-    def get_size(self) -> list[int,int]:
+        if not self._replay_saving:
+            self.replay = False
+            self._replay_buffers = []
+
+    def save_replay(self) -> bool:
 
         """
-        Returns window size as list.
+        Writes the kept gameplay as png sequence on a worker thread.
+
+        The replay buffer is paused until all frames are written.
 
         Args:
 
@@ -1737,33 +2039,3294 @@ class Window:
 
         Returns:
 
-        - Window size as list of integers.
+        - True if saving started.
+        - False if replay is disabled, empty or already saving.
 
         Example:
         ```
-        print(self.window.get_size())
+        self.recorder.save_replay()
         ```
         """
 
-        # Returning window size as a list of integers
-        return self.window_size
+        if not self.replay or self._replay_saving or self._replay_count == 0:
+            return False
 
+        # Oldest kept frame comes first
+        start = (self._replay_head-self._replay_count)%len(self._replay_buffers)
+        order = [(start+index)%len(self._replay_buffers) for index in range(self._replay_count)]
+        path = os.path.join(self.path,f"replay {datetime.datetime.now().strftime('%d.%m.%y %H-%M-%S')}")
+        self._replay_saving = True
+        threading.Thread(target=self._write_replay,args=[path,order],name="Replay writer",daemon=True).start()
+        return True
 
-class Engine:
-    def __init__(self,
-                 catch_error:bool=True,
-                 color_depth:int=16,
-                 delete_old_logs:bool=False,
-                 fps:int=0,
-                 fullscreen:bool=False,
-                 game_version:str="1.0",
+    def _update(self) -> None:
+
+        """
+        Copies the current frame into the recording and replay buffers.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if not self.recording and not self.replay:
+            return
+        start = time.perf_counter()
+
+        # Recording frame, dropped if every buffer is still waiting to be written
+        if self.recording:
+            if self._frame%self._every == 0:
+                try:
+                    index = self._free.get_nowait()
+                    self._copy_frame(self._buffers[index])
+                    self._filled.put(index)
+                    self.captured += 1
+                except queue.Empty:
+                    self.dropped += 1
+            self._frame += 1
+
+        # Replay frame overwrites the oldest kept frame
+        if self.replay and not self._replay_saving:
+            if self._replay_frame%self._replay_every == 0:
+                self._copy_frame(self._replay_buffers[self._replay_head])
+                self._replay_head = (self._replay_head+1)%len(self._replay_buffers)
+                self._replay_count = min(self._replay_count+1,len(self._replay_buffers))
+            self._replay_frame += 1
+
+        self.capture_time = time.perf_counter()-start
+
+    def _create_buffers(self,scale:float,count:int) -> list[pygame.Surface]:
+
+        # Surfaces in main window format, copying into them is a plain memory copy
+        main_surface = self.engine.window.main_surface
+        size = (max(int(main_surface.get_width()*scale),1),max(int(main_surface.get_height()*scale),1))
+        return [pygame.Surface(size,0,main_surface) for _ in range(count)]
+
+    def _copy_frame(self,buffer:pygame.Surface) -> None:
+
+        # Copy or downscale the main window into a buffer
+        main_surface = self.engine.window.main_surface
+        if buffer.get_size() == main_surface.get_size():
+            buffer.blit(main_surface,(0,0))
+        else:
+            pygame.transform.scale(main_surface,buffer.get_size(),buffer)
+
+    def _write(self,path:str,ffmpeg:str=None) -> None:
+
+        """
+        Writes recorded frames until None is queued.
+
+        Args:
+
+        - path (str): Output path without file extension.
+        - ffmpeg (str)=None: Path to ffmpeg, writes a png sequence if None.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+        # Start encoder process with lossless settings
+        encoder = None
+        if ffmpeg != None:
+            width,height = self._buffers[0].get_size()
+            pixel_format = "bgr0" if self._buffers[0].get_masks()[0] == 0xff0000 else "rgb0"
+            fps = (self.engine.fps if self.engine.fps > 0 else 60)/self._every
+            try:
+                encoder = subprocess.Popen([ffmpeg,"-loglevel","error","-y","-f","rawvideo","-pix_fmt",pixel_format,"-s",f"{width}x{height}","-r",str(fps),"-i","-","-c:v","libx264","-preset","ultrafast","-qp","0",f"{path}.mp4"],stdin=subprocess.PIPE)
+            except Exception:
+                encoder = None
+        if encoder == None:
+            os.makedirs(path)
+
+        frame = 0
+        while True:
+            index = self._filled.get()
+            if index == None:
+                break
+
+            # Write frame and hand buffer back for capturing
+            try:
+                if encoder != None:
+                    encoder.stdin.write(self._buffers[index].get_buffer().raw)
+                else:
+                    pygame.image.save(self._buffers[index],os.path.join(path,f"frame_{frame:05d}.png"))
+            except Exception as e:
+                self.engine.jobs.post(self.engine.logger.warning,f"Could not write recorded frame ({e})")
+            self._free.put(index)
+            frame += 1
+
+        if encoder != None:
+            encoder.stdin.close()
+            encoder.wait()
+
+    def _write_replay(self,path:str,order:list[int]) -> None:
+
+        """
+        Writes the kept replay frames as png sequence.
+
+        Args:
+
+        - path (str): Folder to write the frames to.
+        - order (list[int]): Buffer indices from oldest to newest frame.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        try:
+            os.makedirs(path)
+            for frame,index in enumerate(order):
+                pygame.image.save(self._replay_buffers[index],os.path.join(path,f"frame_{frame:05d}.png"))
+        except Exception as e:
+            self.engine.jobs.post(self.engine.logger.warning,f"Could not write replay ({e})")
+
+        # Resume replay capture from an empty buffer
+        self._replay_head = 0
+        self._replay_count = 0
+        self._replay_saving = False
+
+    def _stop(self) -> None:
+
+        """
+        Stops recording when the game closes.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        self.stop()
+
+class Text:
+    def __init__(self,engine,cache_size:int=256) -> None:
+
+        """
+        Initialise the engines text system.
+
+        Rendered texts are kept in a least recently used cache, so text that does not change is only rendered once.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - cache_size (int)=256: Number of rendered texts kept in the cache.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Cache variables
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._fonts = {}
+        self._cache = collections.OrderedDict()
+
+    def get(self,text:str,size:int=24,color:list[int,int,int]=(255,255,255),font:str=None) -> pygame.Surface:
+
+        """
+        Returns a rendered text from the cache or renders it.
+
+        Args:
+
+        - text (str): The text to render.
+        - size (int)=24: Font size.
+        - color (list[int,int,int])=(255,255,255): Text color.
+        - font (str)=None: Path to a font file, the default font if None.
+
+        Returns:
+
+        - The rendered text as pygame.Surface.
+
+        Example:
+        ```
+        sprite = self.text.get("Game Over",64,[255,0,0])
+        ```
+        """
+
+        # Cached text is marked as recently used
+        key = (font,size,tuple(color),str(text))
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        # Load font once per file and size
+        self.misses += 1
+        if (font,size) not in self._fonts:
+            self._fonts[(font,size)] = pygame.font.Font(font,size)
+        sprite = self._fonts[(font,size)].render(str(text),True,color)
+        if pygame.display.get_surface() != None:
+            sprite = sprite.convert_alpha()
+
+        # Remove least recently used text
+        self._cache[key] = sprite
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return sprite
+
+    def render(self,text:str,pos:list[int,int],size:int=24,color:list[int,int,int]=(255,255,255),font:str=None,layer:int=0) -> None:
+
+        """
+        Renders a text to the main window through the render queue.
+
+        Args:
+
+        - text (str): The text to render.
+        - pos (list[int,int]): The position to render the text to.
+        - size (int)=24: Font size.
+        - color (list[int,int,int])=(255,255,255): Text color.
+        - font (str)=None: Path to a font file, the default font if None.
+        - layer (int)=0: Render queue layer, higher layers are drawn on top.
+
+        Example:
+        ```
+        self.text.render(f"Score: {self.score}",[20,20],32)
+        ```
+        """
+
+        self.engine.window.submit(self.get(text,size,color,font),pos,layer)
+
+    def clear(self) -> None:
+
+        """
+        Removes all rendered texts from the cache.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.text.clear()
+        ```
+        """
+
+        self._cache.clear()
+
+class DebugOverlay:
+    def __init__(self,engine,refresh_time:float=0.25,layer:int=1000) -> None:
+
+        """
+        Initialise the engines debug overlay.
+
+        The overlay shows engine stats and custom values, it is toggled with the "debug" input.
+        Values are collected every refresh_time seconds and the overlay is only rendered again if a value changed.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - refresh_time (float)=0.25: Seconds between value updates.
+        - layer (int)=1000: Render queue layer of the overlay.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.visible = False
+        self.refresh_time = refresh_time
+        self.layer = layer
+        self.values = {}
+
+        # Sprite variables
+        self._lines = None
+        self._sprite = None
+        self._elapsed = 0.0
+        self._frames = 0
+        self._frame_time = 0.0
+
+    def set(self,name:str,value) -> None:
+
+        """
+        Sets a custom value shown in the overlay.
+
+        Args:
+
+        - name (str): Name of the value.
+        - value: The value to show.
+
+        Example:
+        ```
+        self.debug_overlay.set("entities",len(self.enemies)+1)
+        ```
+        """
+
+        self.values[name] = value
+
+    def toggle(self) -> None:
+
+        """
+        Shows or hides the overlay.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.debug_overlay.toggle()
+        ```
+        """
+
+        self.visible = not self.visible
+        self._lines = None
+
+    def _update(self) -> None:
+
+        """
+        Collects stats and submits the overlay to the render queue.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Debug input action
+        if self.engine.input.get("debug"):
+            self.toggle()
+        if not self.visible:
+            return
+
+        # Average frame time over the refresh time
+        self._elapsed += self.engine.delta_time
+        self._frame_time += self.engine.delta_time
+        self._frames += 1
+        if self._lines == None or self._elapsed >= self.refresh_time:
+            stats = self.engine.window.render_stats
+            lines = [f"FPS: {self.engine.window.get_fps()}",
+                     f"Frame time: {self._frame_time/self._frames*1000:.1f} ms",
+                     f"Jitter: {self.engine.pacer.get_stats()['stddev']:.2f} ms",
+                     f"Blits: {stats['commands']} in {stats['batches']} batches ({stats['blit_time']*1000:.2f} ms)",
+                     f"Surfaces: {self.engine.memory.get_surface_bytes()/1048576:.1f} MB"]
+            if self.engine.memory.tracing:
+                lines.append(f"Python heap: {tracemalloc.get_traced_memory()[0]/1048576:.1f} MB")
+            lines.extend([f"{name}: {value}" for name,value in self.values.items()])
+            self._elapsed = 0.0
+            self._frame_time = 0.0
+            self._frames = 0
+
+            # Render the overlay again only if a line changed
+            if lines != self._lines:
+                self._lines = lines
+                self._sprite = self._create_sprite(lines)
+
+        self.engine.window.submit(self._sprite,(8,8),self.layer)
+
+    def _create_sprite(self,lines:list[str]) -> pygame.Surface:
+
+        # Line sprites come from the text cache, so unchanged lines are not rendered again
+        sprites = [self.engine.text.get(line,20) for line in lines]
+        sprite = pygame.Surface((max(line.get_width() for line in sprites)+12,sum(line.get_height() for line in sprites)+12),pygame.SRCALPHA)
+        sprite.fill((0,0,0,160))
+        y = 6
+        for line in sprites:
+            sprite.blit(line,(6,y))
+            y += line.get_height()
+        return sprite
+
+class Profiler:
+
+    # Profiler used by the profile decorator
+    _active = None
+
+    def __init__(self,engine,enabled:bool=False,history:int=1000,path:str="profiles") -> None:
+
+        """
+        Initialise the engines frame profiler.
+
+        Every frame phase and every named scope keeps its last durations in a fixed size ring buffer.
+        A summary with percentiles is written on quit.
+
+        Independent of that, the "profile" input action or the --profile-frames N M command line flag
+        records the frames in between with cProfile and writes the stats to the profiles folder.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - enabled (bool)=False: Starts profiling right away.
+        - history (int)=1000: Number of durations kept per phase or scope.
+        - path (str)="profiles": Folder summaries are saved to.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.enabled = False
+        self.history = history
+        self.path = path
+        self._samples = {}
+        self._null_scope = contextlib.nullcontext()
+        if enabled:
+            self.enable()
+
+        # cProfile capture variables
+        self.frame = 0
+        self.capturing = False
+        self._capture = None
+        self._capture_start = 0
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--profile-frames",nargs=2,type=int,metavar=("N","M"))
+        self._capture_frames = parser.parse_known_args()[0].profile_frames
+
+    class _Scope:
+        __slots__ = ["_profiler","_name","_start"]
+
+        def __init__(self,profiler,name:str) -> None:
+            self._profiler = profiler
+            self._name = name
+            self._start = 0.0
+
+        def __enter__(self):
+            self._start = time.perf_counter()
+            return self
+
+        def __exit__(self,*args) -> None:
+            self._profiler.record(self._name,time.perf_counter()-self._start)
+
+    def enable(self) -> None:
+
+        """
+        Starts profiling frame phases and scopes.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.profiler.enable()
+        ```
+        """
+
+        self.enabled = True
+        Profiler._active = self
+
+    def disable(self) -> None:
+
+        """
+        Stops profiling, collected durations are kept.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.profiler.disable()
+        ```
+        """
+
+        self.enabled = False
+
+    def scope(self,name:str):
+
+        """
+        Returns a context manager that measures the duration of its block.
+
+        A shared empty context manager is returned while the profiler is disabled.
+
+        Args:
+
+        - name (str): Name the duration is stored under.
+
+        Example:
+        ```
+        with self.profiler.scope("player.update"):
+            self.player.update()
+        ```
+        """
+
+        if not self.enabled:
+            return self._null_scope
+        return self._Scope(self,name)
+
+    def record(self,name:str,duration:float) -> None:
+
+        """
+        Stores a duration in the ring buffer of a phase or scope.
+
+        Args:
+
+        - name (str): Name of the phase or scope.
+        - duration (float): Duration in seconds.
+
+        Example:
+        ```
+        self.profiler.record("pathfinding",time.perf_counter()-start)
+        ```
+        """
+
+        # Ring buffer as [durations, next index, stored count]
+        samples = self._samples.get(name)
+        if samples == None:
+            samples = [array.array("d",[0.0])*self.history,0,0]
+            self._samples[name] = samples
+        samples[0][samples[1]] = duration
+        samples[1] = (samples[1]+1)%self.history
+        samples[2] = min(samples[2]+1,self.history)
+
+    def start_capture(self) -> bool:
+
+        """
+        Starts recording every function call with cProfile.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - True if the capture started.
+        - False if already capturing.
+
+        Example:
+        ```
+        self.profiler.start_capture()
+        ```
+        """
+
+        if self.capturing:
+            return False
+        self.capturing = True
+        self._capture = cProfile.Profile()
+        self._capture_start = self.frame
+        self._capture.enable()
+        self.engine.logger.info(f"Started cProfile capture at frame {self.frame}")
+        return True
+
+    def stop_capture(self,wait:bool=False) -> bool:
+
+        """
+        Stops the cProfile capture and writes a .prof file and a summary sorted by cumulative time on a worker thread.
+
+        Args:
+
+        - wait (bool)=False: Writes the files on the main thread instead.
+
+        Returns:
+
+        - True if the capture stopped.
+        - False if not capturing.
+
+        Example:
+        ```
+        self.profiler.stop_capture()
+        ```
+        """
+
+        if not self.capturing:
+            return False
+        self._capture.disable()
+        self.capturing = False
+
+        path = os.path.join(self.path,f"{datetime.datetime.now().strftime('%d.%m.%y %H-%M-%S')} frames {self._capture_start}-{self.frame-1}")
+        if wait:
+            self.engine.logger.info(self._write_capture(self._capture,path))
+        else:
+            self.engine.jobs.submit(self._write_capture,self._capture,path,callback=self.engine.logger.info)
+        self._capture = None
+        return True
+
+    def _write_capture(self,capture:cProfile.Profile,path:str) -> str:
+
+        # Raw stats for tools like snakeviz and a readable summary next to it
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        capture.dump_stats(f"{path}.prof")
+        with open(f"{path}.txt","w") as f:
+            stats = pstats.Stats(capture,stream=f)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(60)
+        return f"Saved cProfile capture to {path}.prof"
+
+    def _update_capture(self) -> None:
+
+        """
+        Starts or stops the cProfile capture before a frame, the profile input of the last frame toggles it.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Profile input action toggles the capture
+        if self.engine.input.get("profile"):
+            if self.capturing:
+                self.stop_capture()
+            else:
+                self.start_capture()
+
+        # Frames N to M of the command line flag
+        if self._capture_frames != None:
+            if self.frame == self._capture_frames[0] and not self.capturing:
+                self.start_capture()
+            elif self.frame == self._capture_frames[1]+1 and self.capturing:
+                self.stop_capture()
+                self._capture_frames = None
+        self.frame += 1
+
+    def get_summary(self) -> dict:
+
+        """
+        Returns percentiles of all phases and scopes in milliseconds.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Dict of names with count, mean, p50, p95, p99 and max.
+
+        Example:
+        ```
+        print(self.profiler.get_summary()["frame"]["p99"])
+        ```
+        """
+
+        summary = {}
+        for name,(durations,index,count) in self._samples.items():
+            values = sorted(durations[:count])
+            if not values:
+                continue
+            summary[name] = {"count":count,
+                             "mean":sum(values)/count*1000,
+                             "p50":values[min(round(0.50*(count-1)),count-1)]*1000,
+                             "p95":values[min(round(0.95*(count-1)),count-1)]*1000,
+                             "p99":values[min(round(0.99*(count-1)),count-1)]*1000,
+                             "max":values[-1]*1000}
+        return summary
+
+    def _export(self) -> None:
+
+        """
+        Writes the summary to the profiles folder.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # A running capture is written before the game closes
+        self.stop_capture(wait=True)
+
+        summary = self.get_summary()
+        if not summary:
+            return
+
+        # Table with one phase or scope per line
+        lines = [f"{'name':<32}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+        for name,values in summary.items():
+            lines.append(f"{name:<32}{values['count']:>8}{values['mean']:>10.3f}{values['p50']:>10.3f}{values['p95']:>10.3f}{values['p99']:>10.3f}{values['max']:>10.3f}")
+
+        try:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+            path = os.path.join(self.path,f"{datetime.datetime.now().strftime('%d.%m.%y %H-%M-%S')}.txt")
+            with open(path,"w") as f:
+                f.write("Durations in ms\n"+"\n".join(lines)+"\n")
+            self.engine.logger.info(f"Saved profile summary to {path}")
+        except Exception as e:
+            self.engine.logger.error(e)
+
+def profile(name:str=None):
+
+    """
+    Decorator that measures every call of a function with the engines profiler.
+
+    The function is called directly while the profiler is disabled.
+
+    Args:
+
+    - name (str)=None: Name the duration is stored under, the functions qualified name if None.
+
+    Example:
+    ```
+    @profile("tilemap.draw")
+    def draw(self):
+        ...
+    ```
+    """
+
+    def decorator(function):
+        scope_name = name if name != None else function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args,**kwargs):
+            profiler = Profiler._active
+            if profiler == None or not profiler.enabled:
+                return function(*args,**kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args,**kwargs)
+            finally:
+                profiler.record(scope_name,time.perf_counter()-start)
+        return wrapper
+    return decorator
+
+class FramePacer:
+    def __init__(self,engine,spin_time:float=0.002,history:int=240) -> None:
+
+        """
+        Initialise the engines frame pacer.
+
+        The pacer sleeps most of the remaining frame time and spins on perf_counter for the last moment,
+        delta time is measured from the same timestamps the frames are paced with.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - spin_time (float)=0.002: Seconds before a frame deadline the pacer stops sleeping and spins.
+        - history (int)=240: Number of frame times kept for stats.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.spin_time = spin_time
+        self.history = history
+        self.delta_time = 0.0
+        self._last_time = time.perf_counter()
+        self._deadline = self._last_time
+
+        # Frame time ring buffer
+        self._frame_times = array.array("d",[0.0])*history
+        self._index = 0
+        self._count = 0
+
+    def tick(self) -> float:
+
+        """
+        Waits until the next frame should start and measures the delta time.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Seconds since the last frame.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Sleep coarse and spin the rest for an exact frame start
+        if self.engine.fps > 0:
+            self._deadline += 1/self.engine.fps
+            remaining = self._deadline-time.perf_counter()
+            if remaining > self.spin_time:
+                time.sleep(remaining-self.spin_time)
+            while time.perf_counter() < self._deadline:
+                pass
+
+        # Delta time from the same timestamp the frame is paced with
+        now = time.perf_counter()
+        self.delta_time = now-self._last_time
+        self._last_time = now
+
+        # Deadlines are not caught up after long frames
+        if self.engine.fps <= 0 or now-self._deadline > 1/self.engine.fps:
+            self._deadline = now
+
+        self._frame_times[self._index] = self.delta_time
+        self._index = (self._index+1)%self.history
+        self._count = min(self._count+1,self.history)
+        return self.delta_time
+
+    def reset(self) -> None:
+
+        """
+        Starts pacing again from now, the next delta time is 0.
+
+        Used after the window was blocked, like while it is moved.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.pacer.reset()
+        ```
+        """
+
+        self._last_time = time.perf_counter()
+        self._deadline = self._last_time
+        self.delta_time = 0.0
+
+    def match_refresh_rate(self) -> bool:
+
+        """
+        Sets the target fps to the refresh rate of the display.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - True if the refresh rate is known.
+        - False if the display reports no refresh rate.
+
+        Example:
+        ```
+        self.pacer.match_refresh_rate()
+        ```
+        """
+
+        # Refresh rate of the display the window is on
+        refresh_rate = 0
+        try:
+            if hasattr(pygame.display,"get_current_refresh_rate"):
+                refresh_rate = pygame.display.get_current_refresh_rate()
+            else:
+                refresh_rate = pygame.display.get_desktop_refresh_rates()[0]
+        except Exception:
+            refresh_rate = 0
+        if refresh_rate <= 0:
+            return False
+        self.engine.fps = refresh_rate
+        return True
+
+    def get_fps(self) -> float:
+
+        """
+        Returns the average fps of the kept frame times.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Average fps as float.
+
+        Example:
+        ```
+        fps = self.pacer.get_fps()
+        ```
+        """
+
+        total = sum(self._frame_times[:self._count])
+        if total <= 0:
+            return 0.0
+        return self._count/total
+
+    def get_stats(self) -> dict:
+
+        """
+        Returns frame time stats of the kept frame times in milliseconds.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Dict with mean, stddev, min and max frame time.
+
+        Example:
+        ```
+        jitter = self.pacer.get_stats()["stddev"]
+        ```
+        """
+
+        frame_times = self._frame_times[:self._count]
+        if not frame_times:
+            return {"mean":0.0,"stddev":0.0,"min":0.0,"max":0.0}
+        mean = sum(frame_times)/len(frame_times)
+        variance = sum((frame_time-mean)**2 for frame_time in frame_times)/len(frame_times)
+        return {"mean":mean*1000,"stddev":variance**0.5*1000,"min":min(frame_times)*1000,"max":max(frame_times)*1000}
+
+class Scene:
+
+    # Image paths loaded by the default load function
+    assets = []
+
+    def __init__(self,engine) -> None:
+
+        """
+        Base class of a scene, override the functions a scene needs.
+
+        load runs once before the scene is used, on a worker thread if the scene is preloaded.
+        start runs once on the main thread after load, surfaces should be converted and objects created there.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+
+        Example:
+        ```
+        class MenuScene(Scene):
+            assets = ["data/sprites/menu.png"]
+
+            def start(self):
+                self.background = self.images["data/sprites/menu.png"].convert()
+
+            def draw(self):
+                self.engine.window.render(self.background,(0,0))
+        ```
+        """
+
+        self.engine = engine
+        self.name = None
+        self.loaded = False
+        self.started = False
+        self.draw_below = False
+        self.images = {}
+
+    def load(self) -> None:
+
+        """
+        Loads the declared assets, can run on a worker thread so no display functions should be used.
+        """
+
+        for path in self.assets:
+            self.images[path] = pygame.image.load(path)
+
+    def start(self) -> None:
+
+        """
+        Runs once on the main thread after the scene was loaded.
+        """
+
+    def enter(self) -> None:
+
+        """
+        Runs every time the scene becomes the active scene.
+        """
+
+    def exit(self) -> None:
+
+        """
+        Runs every time the scene stops being the active scene.
+        """
+
+    def unload(self) -> None:
+
+        """
+        Runs when the scene is removed from the scene cache.
+        """
+
+    def update(self) -> None:
+
+        """
+        Runs every frame while the scene is the active scene.
+        """
+
+    def draw(self) -> None:
+
+        """
+        Runs every frame while the scene is the active scene or below an active scene with draw_below.
+        """
+
+class SceneManager:
+    def __init__(self,engine,cache_size:int=4) -> None:
+
+        """
+        Initialise the engines scene system.
+
+        Scenes are kept on a stack, only the top scene is updated.
+        Scenes that leave the stack stay loaded in a least recently used cache, so switching back takes one frame.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - cache_size (int)=4: Number of loaded scenes kept while they are not on the stack.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Scene variables
+        self.cache_size = cache_size
+        self.stack = []
+        self._scene_classes = {}
+        self._cache = collections.OrderedDict()
+        self._loading = {}
+
+    def register(self,name:str,scene_class:type) -> None:
+
+        """
+        Registers a scene class under a name.
+
+        Args:
+
+        - name (str): Name of the scene, also used as game state.
+        - scene_class (type): Subclass of Scene.
+
+        Example:
+        ```
+        self.scenes.register("game",GameScene)
+        ```
+        """
+
+        self._scene_classes[name] = scene_class
+
+    def preload(self,name:str) -> None:
+
+        """
+        Loads a scene on a worker thread so it can be entered without waiting.
+
+        Args:
+
+        - name (str): Name of the registered scene.
+
+        Example:
+        ```
+        self.scenes.preload("game")
+        ```
+        """
+
+        if name in self._cache or name in self._loading or name in [scene.name for scene in self.stack]:
+            return
+
+        # Load as background job, the scene is picked up when it is entered
+        scene = self._create(name)
+        self._loading[name] = [scene,self.engine.jobs.submit(self._load,scene)]
+
+    def push(self,name:str) -> None:
+
+        """
+        Enters a scene on top of the current scene, the current scene is kept on the stack.
+
+        A scene can only be on the stack once, pushing a scene that is already on it logs a warning and does nothing.
+
+        Args:
+
+        - name (str): Name of the registered scene.
+
+        Example:
+        ```
+        self.scenes.push("pause")
+        ```
+        """
+
+        if self._is_on_stack(name):
+            return
+        if self.stack:
+            self.stack[-1].exit()
+        scene = self._get(name)
+        self.stack.append(scene)
+        self.engine.game_state = name
+        scene.enter()
+        self.engine.memory._scene_entered(name)
+
+    def pop(self) -> None:
+
+        """
+        Leaves the current scene and returns to the scene below, the left scene stays in the cache.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.scenes.pop()
+        ```
+        """
+
+        if not self.stack:
+            return
+        scene = self.stack.pop()
+        scene.exit()
+        self._suspend(scene)
+        if self.stack:
+            self.engine.game_state = self.stack[-1].name
+            self.stack[-1].enter()
+            self.engine.memory._scene_entered(self.stack[-1].name)
+
+    def replace(self,name:str) -> None:
+
+        """
+        Leaves the current scene and enters another one in its place.
+
+        Replacing with a scene further down the stack logs a warning and does nothing.
+
+        Args:
+
+        - name (str): Name of the registered scene.
+
+        Example:
+        ```
+        self.scenes.replace("menu")
+        ```
+        """
+
+        if self._is_on_stack(name,self.stack[:-1]):
+            return
+        if self.stack:
+            scene = self.stack.pop()
+            scene.exit()
+            self._suspend(scene)
+        self.push(name)
+
+    def get_current(self) -> Scene | None:
+
+        """
+        Returns the active scene.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - The top scene of the stack or None.
+
+        Example:
+        ```
+        scene = self.scenes.get_current()
+        ```
+        """
+
+        if self.stack:
+            return self.stack[-1]
+        return None
+
+    def update(self) -> None:
+
+        """
+        Updates the active scene.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if self.stack:
+            self.stack[-1].update()
+
+    def draw(self) -> None:
+
+        """
+        Draws the active scene and the scenes below it that should stay visible.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        start = len(self.stack)-1
+        while start > 0 and self.stack[start].draw_below:
+            start -= 1
+        for scene in self.stack[max(start,0):]:
+            scene.draw()
+
+    def _is_on_stack(self,name:str,stack:list[Scene]=None) -> bool:
+
+        # Entering a scene twice would run it twice per frame
+        if stack == None:
+            stack = self.stack
+        if name in [scene.name for scene in stack]:
+            self.engine.logger.warning(f"Scene {name} is already on the stack")
+            return True
+        return False
+
+    def _create(self,name:str) -> Scene:
+
+        # New instance of a registered scene
+        scene = self._scene_classes[name](self.engine)
+        scene.name = name
+        return scene
+
+    def _load(self,scene:Scene) -> None:
+
+        # Errors are logged on the main thread when the scene is entered
+        try:
+            scene.load()
+            scene.loaded = True
+        except Exception as e:
+            scene.loaded = e
+
+    def _get(self,name:str) -> Scene:
+
+        # Cached scenes are ready right away
+        if name in self._cache:
+            return self._cache.pop(name)
+
+        # Wait for a preloading scene or load it now
+        if name in self._loading:
+            scene,job = self._loading.pop(name)
+            job.result()
+
+        else:
+            scene = self._create(name)
+            self._load(scene)
+        if isinstance(scene.loaded,Exception):
+            self.engine.logger.error(scene.loaded)
+            scene.loaded = False
+
+        if not scene.started:
+            scene.start()
+            scene.started = True
+        return scene
+
+    def _suspend(self,scene:Scene) -> None:
+
+        # Scenes still on the stack are not cached
+        if scene in self.stack:
+            return
+        self._cache[scene.name] = scene
+        self._cache.move_to_end(scene.name)
+        while len(self._cache) > self.cache_size:
+            name,old_scene = self._cache.popitem(last=False)
+            old_scene.unload()
+
+class Scheduler:
+    def __init__(self,engine,budget:float=0.002) -> None:
+
+        """
+        Initialise the engines coroutine scheduler.
+
+        Generators and async functions are resumed every frame until they wait.
+        Waiting coroutines are kept in heaps ordered by game time or frame, so idle coroutines cost nothing.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - budget (float)=0.002: Seconds per frame coroutines may run, the rest is resumed next frame.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.budget = budget
+        self.time = 0.0
+        self.frame = 0
+        self.running = 0
+
+        # Waiting coroutines as [due, order, task] heaps
+        self._ready = collections.deque()
+        self._time_heap = []
+        self._frame_heap = []
+        self._until = []
+        self._order = 0
+
+    class Task:
+        __slots__ = ["coroutine","done","cancelled","result"]
+
+        def __init__(self,coroutine) -> None:
+            self.coroutine = coroutine
+            self.done = False
+            self.cancelled = False
+            self.result = None
+
+        def cancel(self) -> None:
+            self.cancelled = True
+
+    class _Wait:
+        __slots__ = ["kind","value"]
+
+        def __init__(self,kind:str,value) -> None:
+            self.kind = kind
+            self.value = value
+
+        def __await__(self):
+            yield self
+
+    def start(self,coroutine):
+
+        """
+        Starts a generator or coroutine, it first runs on the next update.
+
+        Args:
+
+        - coroutine: Generator or coroutine yielding or awaiting wait functions.
+
+        Returns:
+
+        - Task with done, cancelled and result, call cancel to stop it.
+
+        Example:
+        ```
+        def spawn_wave(self):
+            yield self.scheduler.wait_seconds(0.5)
+            self.spawn_enemy()
+            yield self.scheduler.wait_until(lambda: self.player.on_floor)
+
+        self.scheduler.start(self.spawn_wave())
+        ```
+        """
+
+        task = self.Task(coroutine)
+        self._ready.append(task)
+        self.running += 1
+        return task
+
+    def wait_seconds(self,seconds:float):
+
+        """
+        Waits a number of seconds in game time.
+
+        Args:
+
+        - seconds (float): Seconds to wait.
+
+        Example:
+        ```
+        yield self.scheduler.wait_seconds(0.5)
+        await self.scheduler.wait_seconds(0.5)
+        ```
+        """
+
+        return self._Wait("seconds",seconds)
+
+    def wait_frames(self,frames:int):
+
+        """
+        Waits a number of frames, yielding None waits one frame.
+
+        Args:
+
+        - frames (int): Frames to wait.
+
+        Example:
+        ```
+        yield self.scheduler.wait_frames(10)
+        ```
+        """
+
+        return self._Wait("frames",frames)
+
+    def wait_until(self,condition):
+
+        """
+        Waits until a function returns True, it is checked once every frame.
+
+        Args:
+
+        - condition: Function without arguments.
+
+        Example:
+        ```
+        yield self.scheduler.wait_until(lambda: self.player.on_floor)
+        ```
+        """
+
+        return self._Wait("until",condition)
+
+    def clear(self) -> None:
+
+        """
+        Stops all coroutines.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.scheduler.clear()
+        ```
+        """
+
+        for task in self._get_tasks():
+            task.cancelled = True
+            task.coroutine.close()
+        self._ready.clear()
+        self._time_heap = []
+        self._frame_heap = []
+        self._until = []
+        self.running = 0
+
+    def _get_tasks(self) -> list:
+
+        # Every task that is not finished
+        return list(self._ready)+[entry[2] for entry in self._time_heap]+[entry[2] for entry in self._frame_heap]+[entry[1] for entry in self._until]
+
+    def _update(self) -> None:
+
+        """
+        Advances game time and resumes due coroutines within the frame budget.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        self.time += self.engine.delta_time
+        self.frame += 1
+
+        # Only due entries are taken from the heaps
+        while self._time_heap and self._time_heap[0][0] <= self.time:
+            self._ready.append(heapq.heappop(self._time_heap)[2])
+        while self._frame_heap and self._frame_heap[0][0] <= self.frame:
+            self._ready.append(heapq.heappop(self._frame_heap)[2])
+        if self._until:
+            waiting = []
+            for entry in self._until:
+                if entry[1].cancelled or entry[0]():
+                    self._ready.append(entry[1])
+                else:
+                    waiting.append(entry)
+            self._until = waiting
+
+        # Coroutines over the budget are resumed next frame
+        if not self._ready:
+            return
+        end = time.perf_counter()+self.budget
+        for _ in range(len(self._ready)):
+            task = self._ready.popleft()
+            self._resume(task)
+            if time.perf_counter() > end:
+                break
+
+    def _resume(self,task) -> None:
+
+        # Run the coroutine until it waits again
+        if task.cancelled:
+            self.running -= 1
+            return
+        try:
+            wait = task.coroutine.send(None)
+        except StopIteration as e:
+            task.done = True
+            task.result = e.value
+            self.running -= 1
+            return
+        except Exception as e:
+            task.done = True
+            self.running -= 1
+            self.engine.logger.error(e)
+            return
+
+        # Anything but a wait function stops the coroutine
+        if wait != None and not isinstance(wait,self._Wait):
+            task.done = True
+            self.running -= 1
+            task.coroutine.close()
+            name = getattr(task.coroutine,"__qualname__",repr(task.coroutine))
+            self.engine.logger.error(TypeError(f"Coroutine {name} yielded {wait!r}, only None and scheduler wait functions can be yielded"))
+            return
+
+        # Schedule the next resume
+        self._order += 1
+        if wait == None:
+            heapq.heappush(self._frame_heap,[self.frame+1,self._order,task])
+        elif wait.kind == "seconds":
+            heapq.heappush(self._time_heap,[self.time+wait.value,self._order,task])
+        elif wait.kind == "frames":
+            heapq.heappush(self._frame_heap,[self.frame+max(int(wait.value),1),self._order,task])
+        else:
+            self._until.append([wait.value,task])
+
+class JobSystem:
+    def __init__(self,engine,workers:int=None,process_workers:int=None) -> None:
+
+        """
+        Initialise the engines background job system.
+
+        Jobs run on a thread pool or, for heavy calculations, on a process pool.
+        Callbacks of finished jobs are called on the main thread after the events of a frame,
+        so they can safely use surfaces and the display.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - workers (int)=None: Worker threads, chosen by python if None.
+        - process_workers (int)=None: Worker processes, the cpu count if None.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.workers = workers
+        self.process_workers = process_workers
+        self._thread_pool = None
+        self._process_pool = None
+        self._callbacks = queue.SimpleQueue()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.callbacks_last_frame = 0
+        self._latencies = collections.deque(maxlen=256)
+
+    def submit(self,function,*args,callback=None,error_callback=None,process:bool=False,**kwargs) -> concurrent.futures.Future:
+
+        """
+        Runs a function in the background.
+
+        Functions for the process pool and their arguments must be picklable, like functions defined at module level.
+
+        Args:
+
+        - function: Function to run.
+        - *args: Arguments of the function.
+        - callback=None: Called on the main thread with the result.
+        - error_callback=None: Called on the main thread with the exception, errors are logged if None.
+        - process (bool)=False: Runs the function on the process pool.
+        - **kwargs: Keyword arguments of the function.
+
+        Returns:
+
+        - The future of the job.
+
+        Example:
+        ```
+        self.jobs.submit(json.load,open("data/level.json"),callback=self.build_level)
+        ```
+        """
+
+        # Pools are only created when first used
+        if process:
+            if self._process_pool == None:
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(self.process_workers)
+            pool = self._process_pool
+        else:
+            if self._thread_pool == None:
+                self._thread_pool = concurrent.futures.ThreadPoolExecutor(self.workers,thread_name_prefix="Engine job")
+            pool = self._thread_pool
+
+        self.submitted += 1
+        submit_time = time.perf_counter()
+        future = pool.submit(function,*args,**kwargs)
+        future.add_done_callback(lambda future: self._callbacks.put([self._finish,[future,callback,error_callback,submit_time]]))
+        return future
+
+    def post(self,callback,*args) -> None:
+
+        """
+        Calls a function on the main thread after the events of the next frame, can be called from any thread.
+
+        Args:
+
+        - callback: Function to call.
+        - *args: Arguments of the function.
+
+        Example:
+        ```
+        self.jobs.post(self.logger.info,"Level saved")
+        ```
+        """
+
+        self._callbacks.put([callback,args])
+
+    def get_stats(self) -> dict:
+
+        """
+        Returns queue depth and latency metrics.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Dict with pending jobs, submitted, completed and failed jobs, callbacks of the last frame
+          and mean and max milliseconds from submit to callback of the last 256 jobs.
+
+        Example:
+        ```
+        pending = self.jobs.get_stats()["pending"]
+        ```
+        """
+
+        latencies = list(self._latencies)
+        return {"pending":self.submitted-self.completed-self.failed,
+                "submitted":self.submitted,
+                "completed":self.completed,
+                "failed":self.failed,
+                "callbacks":self.callbacks_last_frame,
+                "latency_mean":sum(latencies)/len(latencies)*1000 if latencies else 0.0,
+                "latency_max":max(latencies)*1000 if latencies else 0.0}
+
+    def _finish(self,future:concurrent.futures.Future,callback,error_callback,submit_time:float) -> None:
+
+        # Deliver result or error of a finished job
+        self._latencies.append(time.perf_counter()-submit_time)
+        if future.cancelled():
+            self.failed += 1
+            return
+        error = future.exception()
+        if error != None:
+            self.failed += 1
+            if error_callback != None:
+                error_callback(error)
+            else:
+                self.engine.logger.error(error)
+            return
+        self.completed += 1
+        if callback != None:
+            callback(future.result())
+
+    def _update(self) -> None:
+
+        """
+        Calls all queued callbacks on the main thread.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Only callbacks queued before this frame, callbacks queueing callbacks run next frame
+        count = 0
+        for _ in range(self._callbacks.qsize()):
+            callback,args = self._callbacks.get_nowait()
+            callback(*args)
+            count += 1
+        self.callbacks_last_frame = count
+
+    def _stop(self) -> None:
+
+        """
+        Waits for running jobs, calls their callbacks and shuts the pools down.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if self._thread_pool != None:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+        if self._process_pool != None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+        self._update()
+
+class Timers:
+
+    # Easing functions that map progress from 0 to 1
+    EASINGS = {
+        "linear":lambda t: t,
+        "in_quad":lambda t: t*t,
+        "out_quad":lambda t: t*(2-t),
+        "in_out_quad":lambda t: 2*t*t if t < 0.5 else 1-(-2*t+2)**2/2,
+        "in_cubic":lambda t: t**3,
+        "out_cubic":lambda t: 1-(1-t)**3,
+        "in_out_sine":lambda t: -(math.cos(math.pi*t)-1)/2,
+        "out_back":lambda t: 1+2.70158*(t-1)**3+1.70158*(t-1)**2
+    }
+
+    def __init__(self,engine) -> None:
+
+        """
+        Initialise the engines timer system.
+
+        Timers are kept in a heap ordered by due time in game time, so only due timers are touched each frame.
+        Game time stops while paused or while the delta time is 0, like when the window is moved.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.time = 0.0
+        self.paused = False
+
+        # Timers as [due, order, timer] heap and running tweens
+        self._heap = []
+        self._order = 0
+        self._tweens = []
+
+    class Timer:
+        __slots__ = ["due","interval","count","callback","args","cancelled","done","remaining","order"]
+
+        def __init__(self,due:float,interval:float,count:int,callback,args:tuple) -> None:
+            self.due = due
+            self.interval = interval
+            self.count = count
+            self.callback = callback
+            self.args = args
+            self.cancelled = False
+            self.done = False
+            self.remaining = None
+            self.order = 0
+
+        @property
+        def active(self) -> bool:
+            return not self.done and not self.cancelled
+
+        def cancel(self) -> None:
+            self.cancelled = True
+
+    class Tween:
+        __slots__ = ["target","values","start_values","duration","easing","start","callback","cancelled","done"]
+
+        def __init__(self,target,values:dict,duration:float,easing,callback) -> None:
+            self.target = target
+            self.values = values
+            self.start_values = {}
+            self.duration = duration
+            self.easing = easing
+            self.start = 0.0
+            self.callback = callback
+            self.cancelled = False
+            self.done = False
+
+        @property
+        def active(self) -> bool:
+            return not self.done and not self.cancelled
+
+        def cancel(self) -> None:
+            self.cancelled = True
+
+    def after(self,seconds:float,callback=None,*args):
+
+        """
+        Calls a function once after a number of seconds in game time.
+
+        Args:
+
+        - seconds (float): Seconds to wait.
+        - callback=None: Function to call, the timer can also be used without one by checking active.
+        - *args: Arguments of the function.
+
+        Returns:
+
+        - Timer with active and cancel.
+
+        Example:
+        ```
+        self.timers.after(0.5,self.spawn_enemy,[200,400])
+        self.coyote_timer = self.timers.after(0.2)
+        ```
+        """
+
+        return self._push(self.Timer(self.time+seconds,seconds,1,callback,args))
+
+    def every(self,seconds:float,callback,*args,count:int=None):
+
+        """
+        Calls a function repeatedly every number of seconds in game time.
+
+        Args:
+
+        - seconds (float): Seconds between calls.
+        - callback: Function to call.
+        - *args: Arguments of the function.
+        - count (int)=None: Number of calls, repeats until cancelled if None.
+
+        Returns:
+
+        - Timer with active and cancel.
+
+        Example:
+        ```
+        self.spawn_timer = self.timers.every(2,self.spawn_enemy,count=10)
+        ```
+        """
+
+        return self._push(self.Timer(self.time+seconds,seconds,count,callback,args))
+
+    def tween(self,target,values:dict,duration:float,easing:str="linear",delay:float=0.0,callback=None):
+
+        """
+        Changes attributes of an object over time.
+
+        Args:
+
+        - target: Object with the attributes.
+        - values (dict): Attribute names and their end values.
+        - duration (float): Seconds in game time the tween takes.
+        - easing (str)="linear": Name of an easing in Timers.EASINGS or a function from 0-1 to 0-1.
+        - delay (float)=0.0: Seconds before the tween starts, start values are read when it starts.
+        - callback=None: Function called when the tween finished.
+
+        Returns:
+
+        - Tween with active and cancel.
+
+        Example:
+        ```
+        self.timers.tween(self.camera,{"x":-400,"y":0},1.5,"in_out_sine")
+        ```
+        """
+
+        if type(easing) == str:
+            easing = self.EASINGS[easing]
+        tween = self.Tween(target,dict(values),max(duration,0.000001),easing,callback)
+        if delay > 0:
+            self.after(delay,self._start_tween,tween)
+        else:
+            self._start_tween(tween)
+        return tween
+
+    def cancel(self,timer) -> None:
+
+        """
+        Cancels a timer or tween, None is ignored.
+
+        Args:
+
+        - timer: Timer or tween to cancel.
+
+        Example:
+        ```
+        self.timers.cancel(self.spawn_timer)
+        ```
+        """
+
+        if timer != None:
+            timer.cancel()
+
+    def is_active(self,timer) -> bool:
+
+        """
+        Returns if a timer or tween is still running, None is never active.
+
+        Args:
+
+        - timer: Timer or tween to check.
+
+        Example:
+        ```
+        if self.timers.is_active(self.coyote_timer):
+            self.jump()
+        ```
+        """
+
+        return timer != None and timer.active
+
+    def pause(self,timer=None) -> None:
+
+        """
+        Pauses a single timer or all timers and tweens if no timer is given.
+
+        Args:
+
+        - timer=None: Timer to pause.
+
+        Example:
+        ```
+        self.timers.pause()
+        ```
+        """
+
+        if timer == None:
+            self.paused = True
+        elif timer.active and timer.remaining == None:
+            timer.remaining = max(timer.due-self.time,0.0)
+
+    def resume(self,timer=None) -> None:
+
+        """
+        Resumes a paused timer or all timers and tweens if no timer is given.
+
+        Args:
+
+        - timer=None: Timer to resume.
+
+        Example:
+        ```
+        self.timers.resume()
+        ```
+        """
+
+        if timer == None:
+            self.paused = False
+        elif timer.remaining != None:
+            timer.due = self.time+timer.remaining
+            timer.remaining = None
+            if timer.active:
+                self._push(timer)
+
+    def _push(self,timer):
+
+        # Order keeps timers with the same due time in creation order, older entries of a timer are skipped
+        self._order += 1
+        timer.order = self._order
+        heapq.heappush(self._heap,[timer.due,self._order,timer])
+        return timer
+
+    def _start_tween(self,tween) -> None:
+
+        # Start values are read when the tween starts
+        if tween.cancelled:
+            return
+        tween.start = self.time
+        tween.start_values = {name:getattr(tween.target,name) for name in tween.values}
+        self._tweens.append(tween)
+
+    def _update(self) -> None:
+
+        """
+        Advances game time, calls due timers and updates running tweens.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if self.paused:
+            return
+        self.time += self.engine.delta_time
+
+        # Only due timers are taken from the heap
+        while self._heap and self._heap[0][0] <= self.time:
+            due,order,timer = heapq.heappop(self._heap)
+            if timer.cancelled or timer.remaining != None or order != timer.order:
+                continue
+            if timer.count != None:
+                timer.count -= 1
+            if timer.count == None or timer.count > 0:
+                timer.due += timer.interval
+                if timer.interval <= 0:
+                    timer.due = self.time+0.000001
+                self._push(timer)
+            else:
+                timer.done = True
+            if timer.callback != None:
+                timer.callback(*timer.args)
+
+        # Running tweens
+        if self._tweens:
+            running = []
+            for tween in self._tweens:
+                if tween.cancelled:
+                    continue
+                progress = min((self.time-tween.start)/tween.duration,1.0)
+                eased = tween.easing(progress)
+                for name,end in tween.values.items():
+                    start = tween.start_values[name]
+                    setattr(tween.target,name,start+(end-start)*eased)
+                if progress >= 1.0:
+                    tween.done = True
+                    if tween.callback != None:
+                        tween.callback()
+                else:
+                    running.append(tween)
+            self._tweens = running
+
+class Watchdog:
+    def __init__(self,engine,enabled:bool=False,threshold:float=0.25,interval:float=0.005,depth:int=24) -> None:
+
+        """
+        Initialise the engines stall watchdog.
+
+        The main loop only stores a timestamp after every frame. A background thread checks it a few times per threshold
+        and samples the stack of the main thread while a frame takes longer than the threshold.
+        When the frame finishes the most sampled stacks are logged as warning.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - enabled (bool)=False: Starts the watchdog thread when the main loop starts.
+        - threshold (float)=0.25: Seconds a frame may take before its stack is sampled.
+        - interval (float)=0.005: Seconds between stack samples of a stalled frame.
+        - depth (int)=24: Maximum number of stack frames kept per sample.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.enabled = enabled
+        self.threshold = threshold
+        self.interval = interval
+        self.depth = depth
+        self.stalls = 0
+        self._beat = time.perf_counter()
+        self._thread = None
+        self._thread_id = None
+        self._stop_event = threading.Event()
+
+    def _start(self) -> None:
+
+        """
+        Starts the watchdog thread for the thread running the main loop.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if not self.enabled or self._thread != None:
+            return
+        self._thread_id = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch,name="Engine watchdog",daemon=True)
+        self._thread.start()
+
+    def _update(self) -> None:
+
+        """
+        Marks the current frame as finished.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        self._beat = time.perf_counter()
+
+    def _watch(self) -> None:
+
+        """
+        Checks the heartbeat of the main loop and samples its stack while it is stalled.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        stalled_beat = None
+        samples = collections.Counter()
+        while not self._stop_event.wait(self.interval if stalled_beat != None else self.threshold/4):
+            beat = self._beat
+
+            # Stalled frame finished, log it on the main thread
+            if stalled_beat != None and beat != stalled_beat:
+                self.stalls += 1
+                self.engine.jobs.post(self._report,beat-stalled_beat,samples)
+                stalled_beat = None
+                samples = collections.Counter()
+
+            if stalled_beat == None and time.perf_counter()-beat > self.threshold:
+                stalled_beat = beat
+
+            # Stack of the main thread from the outermost call to the current line
+            if stalled_beat != None:
+                frame = sys._current_frames().get(self._thread_id)
+                stack = []
+                while frame != None and len(stack) < self.depth:
+                    stack.append((frame.f_code.co_filename,frame.f_lineno,frame.f_code.co_name))
+                    frame = frame.f_back
+                samples[tuple(reversed(stack))] += 1
+
+        # Frame still stalled when the game closes
+        if stalled_beat != None and samples:
+            self.stalls += 1
+            self._report(time.perf_counter()-stalled_beat,samples)
+
+    def _report(self,duration:float,samples:collections.Counter,count:int=3) -> None:
+
+        # Most sampled stacks with their share of all samples
+        total = sum(samples.values())
+        lines = [f"Frame stalled for {duration*1000:.0f} ms, {total} stack samples"]
+        for stack,hits in samples.most_common(count):
+            lines.append(f"  {hits/total*100:.0f}% ({hits} samples):")
+            for filename,line,function in stack:
+                lines.append(f"    {filename}:{line} in {function}")
+        self.engine.logger.warning("\n".join(lines))
+
+    def _stop(self) -> None:
+
+        """
+        Stops the watchdog thread when the game closes.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if self._thread != None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+class Memory:
+    def __init__(self,engine,tracing:bool=False) -> None:
+
+        """
+        Initialise the engines memory report.
+
+        Surfaces of the engine, of scenes and every surface registered with window.register_surface or memory.track
+        are counted with their pixel memory and grouped by owner. The surface total is recorded whenever a scene is entered.
+        Owners are referenced weakly, so the report never keeps the objects it measures alive.
+        With tracing the python heap is traced with tracemalloc and the biggest changes since the last scene are logged.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - tracing (bool)=False: Starts tracing python allocations right away.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine variable
+        self.engine = engine
+
+        # Setting starting variables
+        self.tracing = False
+        self.history = []
+        self._tracked = []
+        self._snapshot = None
+        self._snapshot_name = None
+        if tracing:
+            self.start_tracing()
+
+    def track(self,owner,key,name:str=None) -> None:
+
+        """
+        Counts a surface in the memory report that is not registered with the window, like caches and buffers.
+
+        The surface is looked up as owner[key] for dicts and lists and as an attribute otherwise,
+        the value can also be a list or dict of surfaces. Objects drop out of the report once they are deleted.
+
+        Args:
+
+        - owner: Dict, list or object holding the surface.
+        - key: Key, index or attribute name of the surface.
+        - name (str)=None: Group in the report, the class name of the owner if None.
+
+        Example:
+        ```
+        self.engine.memory.track(self,"_gradients")
+        ```
+        """
+
+        # Deleted owners are removed on the way
+        self._tracked = [entry for entry in self._tracked if entry[0]() != None]
+        for entry in self._tracked:
+            if entry[0]() is owner and entry[1] == key:
+                return
+        self._tracked.append([_owner_reference(owner),key,name])
+
+    def untrack(self,owner,key) -> None:
+
+        """
+        Removes a surface added with track.
+
+        Args:
+
+        - owner: Dict, list or object holding the surface.
+        - key: Key, index or attribute name of the surface.
+
+        Example:
+        ```
+        self.engine.memory.untrack(self,"_gradients")
+        ```
+        """
+
+        for index,entry in enumerate(self._tracked):
+            if entry[0]() is owner and entry[1] == key:
+                del self._tracked[index]
+                return
+
+    def start_tracing(self,frames:int=1) -> None:
+
+        """
+        Starts tracing python allocations with tracemalloc, this slows the game down noticeably.
+
+        Args:
+
+        - frames (int)=1: Number of stack frames stored per allocation.
+
+        Example:
+        ```
+        self.memory.start_tracing()
+        ```
+        """
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.tracing = True
+        self._snapshot = None
+        self._snapshot_name = None
+
+    def stop_tracing(self) -> None:
+
+        """
+        Stops tracing python allocations.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.memory.stop_tracing()
+        ```
+        """
+
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+            self._snapshot = None
+
+    def get_surfaces(self) -> dict:
+
+        """
+        Returns the pixel memory of all known surfaces grouped by owner, surfaces shared by several owners are counted once.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Dict of owner names with surfaces and bytes, largest first.
+
+        Example:
+        ```
+        print(self.memory.get_surfaces()["Tilemap"]["bytes"])
+        ```
+        """
+
+        groups = {}
+        seen = set()
+
+        # Engine surfaces
+        window = self.engine.window
+        self._count(groups,seen,"Window",[window.display_surface,window.main_surface,window._present_buffer])
+        self._count(groups,seen,"Text",list(self.engine.text._cache.values()))
+        self._count(groups,seen,"DebugOverlay",self.engine.debug_overlay._sprite)
+        self._count(groups,seen,"Recorder",[self.engine.recorder._buffers,self.engine.recorder._replay_buffers])
+
+        # Images of loaded scenes
+        for scene in self.engine.scenes.stack+list(self.engine.scenes._cache.values()):
+            self._count(groups,seen,f"Scene {scene.name}",scene.images)
+
+        # Registered and tracked surfaces
+        for reference,key,name in window._registered_surfaces+self._tracked:
+            owner = reference()
+            if owner == None:
+                continue
+            if type(owner) in [dict,list]:
+                value = owner[key]
+            else:
+                value = getattr(owner,key,None)
+            self._count(groups,seen,name if name != None else type(owner).__name__,value)
+
+        return {name:{"surfaces":group[0],"bytes":group[1]} for name,group in sorted(groups.items(),key=lambda item: -item[1][1])}
+
+    def _count(self,groups:dict,seen:set,name:str,value) -> None:
+
+        # Subsurfaces share the pixels of their parent
+        if isinstance(value,pygame.Surface):
+            if id(value) in seen:
+                return
+            seen.add(id(value))
+            group = groups.setdefault(name,[0,0])
+            group[0] += 1
+            if value.get_parent() == None:
+                group[1] += value.get_pitch()*value.get_height()
+        elif type(value) in [list,tuple]:
+            for item in value:
+                self._count(groups,seen,name,item)
+        elif type(value) == dict:
+            for item in value.values():
+                self._count(groups,seen,name,item)
+
+    def get_surface_bytes(self) -> int:
+
+        """
+        Returns the pixel memory of all known surfaces.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Total in bytes.
+
+        Example:
+        ```
+        megabytes = self.memory.get_surface_bytes()/1048576
+        ```
+        """
+
+        return sum(group["bytes"] for group in self.get_surfaces().values())
+
+    def get_report(self) -> str:
+
+        """
+        Returns the surface memory per owner, the surface total of every entered scene and the traced python heap.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Report as text.
+
+        Example:
+        ```
+        print(self.memory.get_report())
+        ```
+        """
+
+        surfaces = self.get_surfaces()
+        lines = [f"Surfaces: {sum(group['bytes'] for group in surfaces.values())/1048576:.2f} MB"]
+        for name,group in surfaces.items():
+            lines.append(f"  {name:<32}{group['surfaces']:>8} surfaces{group['bytes']/1048576:>10.2f} MB")
+        if self.history:
+            lines.append("Surfaces after entering scenes: "+" -> ".join(f"{name} {size/1048576:.2f} MB" for name,size in self.history))
+        if self.tracing:
+            current,peak = tracemalloc.get_traced_memory()
+            lines.append(f"Python heap: {current/1048576:.2f} MB (peak {peak/1048576:.2f} MB)")
+        return "\n".join(lines)
+
+    def _scene_entered(self,name:str) -> None:
+
+        """
+        Records the surface total and logs the python heap changes since the last scene.
+
+        Args:
+
+        - name (str): Name of the entered scene.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        self.history.append([name,self.get_surface_bytes()])
+        self.history = self.history[-32:]
+        if not self.tracing:
+            return
+
+        # Allocations of tracemalloc and the import system are left out
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False,tracemalloc.__file__),tracemalloc.Filter(False,"<frozen importlib._bootstrap*>")])
+        if self._snapshot != None:
+            lines = [f"Python heap changes from scene {self._snapshot_name} to {name}:"]
+            for stat in snapshot.compare_to(self._snapshot,"lineno")[:10]:
+                frame = stat.traceback[0]
+                lines.append(f"  {frame.filename}:{frame.lineno} {stat.size_diff/1024:+.1f} KB ({stat.count_diff:+d} blocks)")
+            self.engine.logger.info("\n".join(lines))
+        self._snapshot = snapshot
+        self._snapshot_name = name
+
+    def _export(self) -> None:
+
+        """
+        Logs the memory report when the game closes.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        try:
+            self.engine.logger.info("Memory report\n"+self.get_report())
+        except Exception as e:
+            self.engine.logger.error(e)
+
+def _owner_reference(owner):
+
+    # Weak reference to an owner of surfaces, plain dicts and lists are referenced strongly
+    try:
+        return weakref.ref(owner)
+    except TypeError:
+        return lambda: owner
+
+class Window:
+    def __init__(self,engine,set_window_size=None,fullscreen=False,resizable=True,windowless=False,window_centered=True,vsync=False,window_name="Frostlight Engine",mouse_visible=True,color_depth=24,logical_size=None,scale_mode="smooth") -> None:
+
+        """
+        Initialise the engines window system.
+
+        The window system manages all window events and rendering.
+
+        Args:
+
+        - engine (Engine): The engine to access specific variables.
+        - set_window_size (list)=None: Size of window.
+        - fullscreen (bool)=False: Sets windows fullscreen mode.
+        - resizable (bool)=True: Sets windows resizability.
+        - windowless (bool)=False: Removes window interaction menu at the top.
+        - window_centered (bool)=True: Sets window centered state.
+        - vsync (bool)=False: Sets vsync state.
+        - window_name (str)="Frostlight Engine": Default name to display.
+        - mouse_visible (bool)=True: mouses visibility state.
+        - color_depth (int)=24: Window color depth.
+        - logical_size (list)=None: Fixed resolution the game renders at, 1920x1080 if None.
+        - scale_mode (str)="smooth": How the frame is scaled to the window: ["smooth", "integer"].
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine Variable
+        self.engine = engine
+
+        # Setting startup variables
+        self.windowless = windowless
+        self.window_centered = window_centered
+        self.vsync = vsync
+        self.color_depth = color_depth
+        self.fullscreen = fullscreen
+        self.window_name = window_name
+        self.mouse_visible = mouse_visible
+        self.window_size = set_window_size
+        self.resizable = resizable
+
+        # Logical resolution variables
+        self.logical_size = [1920,1080]
+        if logical_size != None:
+            self.logical_size = [int(logical_size[0]),int(logical_size[1])]
+        self.scale_mode = scale_mode
+        self._present_size = None
+        self._present_rect = pygame.Rect(0,0,self.logical_size[0],self.logical_size[1])
+        self._present_buffer = None
+
+        # Dirty rect variables, frames that change more than the threshold of the window are updated fully
+        # Games that clear the whole window every frame, like the one screen level, never get below it
+        self.dirty_rect_threshold = 0.6
+        self._previous_dirty_rects = []
+
+        # Display format variables
+        self._registered_surfaces = []
+        self._display_format = None
+
+        # Render queue variables
+        self.render_stats = {"commands":0,"batches":0,"blit_time":0.0}
+        self._render_queue = {}
+        self._blend_layers = set()
+        self._queued_commands = 0
+
+    def _create(self):
+
+        """
+        Creates main window instance.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        if not self.windowless:
+            pygame.display.init()
+
+            # Center window
+            if self.window_centered:
+                os.environ['SDL_VIDEO_CENTERED'] = '1'
+            else:
+                os.environ['SDL_VIDEO_CENTERED'] = '0'
+
+            # Create window
+            display_size = [int(pygame.display.Info().current_w),int(pygame.display.Info().current_h)]
+            if self.fullscreen: 
+
+                # Fullscreen window
+                self.display_surface = pygame.display.set_mode(display_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.FULLSCREEN,vsync=self.vsync,depth=self.color_depth)
+            else:
+
+                # Calculate fitting window size
+                if self.window_size == None:
+                    self.window_size = [display_size[0],display_size[1]*0.94]
+
+                if self.resizable:
+
+                    # Resizable window
+                    self.display_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE,vsync=self.vsync,depth=self.color_depth)
+                else: 
+
+                    # Fixed size window
+                    self.display_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.NOFRAME,vsync=self.vsync,depth=self.color_depth)
+
+            # Offscreen surface the game renders to at logical resolution
+            if not hasattr(self,"main_surface"):
+                self.main_surface = pygame.Surface(self.logical_size,0,32)
+            self._present_size = None
+            self._reconvert_surfaces()
+
+            # Change window attributes
+            pygame.display.set_caption(self.window_name)
+            pygame.mouse.set_visible(self.mouse_visible)
+        else:
+
+            # Headless mode uses the dummy video driver so surfaces can still be converted
+            pygame.display.quit()
+            video_driver = os.environ.get("SDL_VIDEODRIVER")
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            pygame.display.init()
+            self.display_surface = pygame.display.set_mode((1,1))
+
+            # The driver is only read on init, the previous setting is restored for the rest of the process
+            if video_driver == None:
+                del os.environ["SDL_VIDEODRIVER"]
+            else:
+                os.environ["SDL_VIDEODRIVER"] = video_driver
+
+            # Offscreen surface the game renders to at logical resolution
+            if not hasattr(self,"main_surface"):
+                self.main_surface = pygame.Surface(self.logical_size,0,32)
+
+    def export_frame(self,path:str) -> bool:
+
+        """
+        Saves the current frame of the main window as image.
+
+        Args:
+
+        - path (str): File to save the frame to, the file extension sets the format like .png.
+
+        Returns:
+
+        - True if the frame was saved.
+        - False if something went wrong.
+
+        Example:
+        ```
+        self.window.export_frame(os.path.join("screenshots","frame.png"))
+        ```
+        """
+
+        # Save main window surface to file
+        try:
+            pygame.image.save(self.main_surface,path)
+            return True
+        except Exception as e:
+            self.engine.logger.error(e)
+            return False
+
+    def get_frame_buffer(self,format:str="RGB") -> bytes:
+
+        """
+        Returns the pixels of the current frame of the main window.
+
+        Args:
+
+        - format (str)="RGB": Pixel format like "RGB" or "RGBA".
+
+        Returns:
+
+        - Raw pixel data as bytes, row by row in logical resolution.
+
+        Example:
+        ```
+        pixels = self.window.get_frame_buffer()
+        ```
+        """
+
+        # Copy main window pixels
+        return pygame.image.tobytes(self.main_surface,format)
+
+    def _present(self,rects:list[pygame.Rect]=None) -> list[pygame.Rect] | None:
+
+        """
+        Scales the logical frame once onto the window, or only the changed areas if rects are given.
+
+        Args:
+
+        - rects (list[pygame.Rect])=None: Changed areas in logical resolution, the whole frame if None.
+
+        Returns:
+
+        - The changed areas in window coordinates, None if the whole window changed.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Recalculate scaling only when the window size changed
+        display_size = self.display_surface.get_size()
+        if display_size != self._present_size:
+            self._update_present_rect(display_size)
+            rects = None
+
+        # Present frame unscaled, or scaled into the cached buffer
+        if self._present_buffer == None:
+            if rects == None:
+                self.display_surface.blit(self.main_surface,self._present_rect)
+            else:
+                rects = [self.display_surface.blit(self.main_surface,rect.move(self._present_rect.topleft),rect) for rect in rects]
+        elif rects == None:
+            if self.scale_mode == "smooth":
+                pygame.transform.smoothscale(self.main_surface,self._present_rect.size,self._present_buffer)
+            else:
+                pygame.transform.scale(self.main_surface,self._present_rect.size,self._present_buffer)
+            self.display_surface.blit(self._present_buffer,self._present_rect)
+        else:
+            rects = [self._present_scaled_rect(rect) for rect in rects]
+        return rects
+
+    def _present_scaled_rect(self,rect:pygame.Rect) -> pygame.Rect:
+
+        """
+        Scales one changed area of the logical frame onto the window.
+
+        The area is scaled with a small margin, so smooth scaling blends the edges like a full frame would.
+
+        Args:
+
+        - rect (pygame.Rect): Changed area in logical resolution.
+
+        Returns:
+
+        - The changed area in window coordinates.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        scale_x = self._present_rect.width/self.logical_size[0]
+        scale_y = self._present_rect.height/self.logical_size[1]
+
+        # Area with margin in logical and in frame coordinates
+        source = rect.inflate(4,4).clip(self.main_surface.get_rect())
+        if source.width == 0 or source.height == 0:
+            return pygame.Rect(self._present_rect.topleft,(0,0))
+
+        left,top = math.floor(source.x*scale_x),math.floor(source.y*scale_y)
+        size = (max(math.ceil(source.right*scale_x)-left,1),max(math.ceil(source.bottom*scale_y)-top,1))
+        if self.scale_mode == "smooth":
+            scaled = pygame.transform.smoothscale(self.main_surface.subsurface(source),size)
+        else:
+            scaled = pygame.transform.scale(self.main_surface.subsurface(source),size)
+
+        # Only the area itself is copied, the margin is cut off
+        target = pygame.Rect(math.floor(rect.x*scale_x),math.floor(rect.y*scale_y),0,0)
+        target.width = math.ceil(rect.right*scale_x)-target.x
+        target.height = math.ceil(rect.bottom*scale_y)-target.y
+        target = target.clip(pygame.Rect(0,0,self._present_rect.width,self._present_rect.height))
+        return self.display_surface.blit(scaled,target.move(self._present_rect.topleft),target.move(-left,-top))
+
+    def _update_present_rect(self,display_size:list[int,int]):
+
+        """
+        Calculates where and how large the logical frame is shown in the window.
+
+        Args:
+
+        - display_size (list[int,int]): Current size of the window.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        self._present_size = display_size
+        scale = min(display_size[0]/self.logical_size[0],display_size[1]/self.logical_size[1])
+
+        # Integer scaling keeps pixels sharp if the window is large enough
+        if self.scale_mode == "integer" and scale >= 1:
+            scale = int(scale)
+
+        size = (max(int(self.logical_size[0]*scale),1),max(int(self.logical_size[1]*scale),1))
+        self._present_rect = pygame.Rect((display_size[0]-size[0])//2,(display_size[1]-size[1])//2,size[0],size[1])
+
+        # Scaled frames are written into a buffer that is reused while the size stays the same
+        if size == tuple(self.logical_size):
+            self._present_buffer = None
+        else:
+            self._present_buffer = pygame.Surface(size,0,self.main_surface)
+
+        # Clear borders around the frame
+        self.display_surface.fill((0,0,0))
+
+    def map_position(self,position:list[int,int]) -> list[int,int]:
+
+        """
+        Maps a window position to the logical resolution.
+
+        Args:
+
+        - position (list[int,int]): Position inside the window, e.g. the mouse position.
+
+        Returns:
+
+        - Position in logical resolution as list of integers.
+
+        Example:
+        ```
+        logical_pos = self.window.map_position(pygame.mouse.get_pos())
+        ```
+        """
+
+        # Positions inside the borders are mapped outside of the logical frame
+        return [int((position[0]-self._present_rect.x)*self.logical_size[0]/self._present_rect.width),
+                int((position[1]-self._present_rect.y)*self.logical_size[1]/self._present_rect.height)]
+
+    def render(self,sprite:pygame.Surface,pos:list[int,int] | pygame.Rect,area:pygame.Rect=None):
+
+        """
+        Renders a sprite to the main window.
+
+        Sprites that are completely outside of the window are skipped.
+
+        Args:
+
+        - sprite (pygame.Surface): The sprite to render.
+        - pos (list[int,int]): The position to render the sprite to.
+        - area (pygame.Rect)=None: Part of the sprite to render, the whole sprite if None.
+
+        Example:
+        ```
+        self.window.render(player_sprite,player_pos)
+        ```
+        """
+
+        # Skip sprites outside of the main window
+        if not self.is_visible(sprite,pos,area):
+            return
+
+        # Renders sprite to main window
+        rect = self.main_surface.blit(sprite,pos,area)
+        if self.engine.dirty_rects:
+            self.engine.display_update_rects.append(rect)
+
+    def submit(self,sprite:pygame.Surface,pos:list[int,int] | pygame.Rect,layer:int=0,blend:int=0):
+
+        """
+        Queues a sprite to be rendered after the draw function.
+
+        Queued sprites are sorted by layer and every layer is rendered in a single batch,
+        lower layers first and in submission order within a layer.
+        Sprites outside of the main window are skipped.
+
+        The queue is rendered after the draw function, so everything drawn right away with render, render_batch
+        or fill is below every queued layer, negative layers included. Submit everything that needs ordering.
+
+        Args:
+
+        - sprite (pygame.Surface): The sprite to render.
+        - pos (list[int,int]): The position to render the sprite to.
+        - layer (int)=0: Layer to render the sprite on.
+        - blend (int)=0: Pygame blend flag like pygame.BLEND_RGB_ADD.
+
+        Example:
+        ```
+        self.window.submit(player_sprite,player_pos,layer=1)
+        ```
+        """
+
+        # Skip sprites outside of the main window
+        if not self.is_visible(sprite,pos):
+            return
+
+        # Add render command to its layer
+        if layer not in self._render_queue:
+            self._render_queue[layer] = []
+        if blend == 0:
+            self._render_queue[layer].append((sprite,pos))
+        else:
+            self._render_queue[layer].append((sprite,pos,None,blend))
+            self._blend_layers.add(layer)
+        self._queued_commands += 1
+
+    def _flush(self):
+
+        """
+        Renders all queued sprites sorted by layer with one batch per layer.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        start = time.perf_counter()
+        batches = 0
+        for layer in sorted(self._render_queue):
+            commands = self._render_queue[layer]
+            if not commands:
+                continue
+
+            # fblits is faster but has no blend flags and returns no rects
+            if self.engine.dirty_rects:
+                self.engine.display_update_rects.extend(self.main_surface.blits(commands))
+            elif layer in self._blend_layers or not hasattr(self.main_surface,"fblits"):
+                self.main_surface.blits(commands,False)
+            else:
+                self.main_surface.fblits(commands)
+            batches += 1
+
+        # Store stats of this frame and clear queue
+        self.render_stats = {"commands":self._queued_commands,"batches":batches,"blit_time":time.perf_counter()-start}
+        self._render_queue = {}
+        self._blend_layers = set()
+        self._queued_commands = 0
+
+    def render_batch(self,sprite:pygame.Surface,positions,layer:int=None) -> None:
+
+        """
+        Renders one sprite at many positions with a single blit call.
+
+        Positions are not culled, so only pass positions that are on screen.
+        Any iterable works, a lazy zip of x and y lists avoids building a list of pairs.
+
+        Args:
+
+        - sprite (pygame.Surface): The sprite to render.
+        - positions (iterable of [int,int]): The positions to render the sprite to.
+        - layer (int)=None: Render queue layer like submit, rendered right away if None.
+
+        Example:
+        ```
+        self.window.render_batch(spark_sprite,[[10,10],[20,15],[30,12]])
+        ```
+        """
+
+        # Copies are added to the batch of their layer
+        if layer != None:
+            if layer not in self._render_queue:
+                self._render_queue[layer] = []
+            commands = self._render_queue[layer]
+            count = len(commands)
+            commands.extend(zip(itertools.repeat(sprite),positions))
+            self._queued_commands += len(commands)-count
+            return
+
+        # One rect around all copies
+        if self.engine.dirty_rects:
+            positions = list(positions)
+            if not positions:
+                return
+            xs = [pos[0] for pos in positions]
+            ys = [pos[1] for pos in positions]
+            rect = pygame.Rect(min(xs),min(ys),max(xs)-min(xs)+sprite.get_width(),max(ys)-min(ys)+sprite.get_height())
+            self.engine.display_update_rects.append(rect.clip(self.main_surface.get_rect()))
+
+        # Renders all copies of the sprite to main window
+        if hasattr(self.main_surface,"fblits"):
+            self.main_surface.fblits(zip(itertools.repeat(sprite),positions))
+        else:
+            self.main_surface.blits(zip(itertools.repeat(sprite),positions),False)
+
+    def mark_dirty(self,rect:pygame.Rect) -> None:
+
+        """
+        Marks an area of the main window as changed when dirty rects are enabled.
+
+        Only needed for drawing that does not go through the window, like pygame.draw calls.
+
+        Args:
+
+        - rect (pygame.Rect): The changed area.
+
+        Example:
+        ```
+        pygame.draw.rect(self.window.main_surface,(7,132,227),rect,1)
+        self.window.mark_dirty(rect)
+        ```
+        """
+
+        # Store changed area clipped to the main window
+        if self.engine.dirty_rects:
+            self.engine.display_update_rects.append(pygame.Rect(rect).clip(self.main_surface.get_rect()))
+
+    def _get_update_rects(self) -> list[pygame.Rect] | None:
+
+        """
+        Collects the window areas that changed this or the previous frame.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - List of merged rects in logical resolution.
+        - None if the changed area is large enough that a full update is cheaper.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Previous rects are included so content drawn last frame gets erased
+        rects = self.engine.display_update_rects+self._previous_dirty_rects
+        self._previous_dirty_rects = self.engine.display_update_rects
+        self.engine.display_update_rects = []
+
+        # Merge overlapping rects
+        merged = []
+        for rect in rects:
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            rect = rect.copy()
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+
+        # Fall back to a full update above the threshold
+        area = sum(rect.width*rect.height for rect in merged)
+        if area > self.logical_size[0]*self.logical_size[1]*self.dirty_rect_threshold:
+            return None
+        return merged
+
+    def is_visible(self,sprite:pygame.Surface,pos:list[int,int] | pygame.Rect,area:pygame.Rect=None) -> bool:
+
+        """
+        Checks if a sprite rendered at a position would be visible in the main window.
+
+        Args:
+
+        - sprite (pygame.Surface): The sprite to check.
+        - pos (list[int,int]): The position the sprite would be rendered to.
+        - area (pygame.Rect)=None: Part of the sprite to check, the whole sprite if None.
+
+        Returns:
+
+        - True if any part of the sprite is inside the main window.
+
+        Example:
+        ```
+        if self.window.is_visible(player_sprite,player_pos):
+            print("Player on screen")
+        ```
+        """
+
+        # Compare sprite bounds with main window bounds
+        if area == None:
+            width,height = sprite.get_size()
+        else:
+            width,height = area[2],area[3]
+        return pos[0] < self.main_surface.get_width() and pos[1] < self.main_surface.get_height() and pos[0]+width > 0 and pos[1]+height > 0
+
+    def resize(self,new_window_size:list[int,int]):
+
+        """
+        Resizes the main window.
+
+        Args:
+
+        - new_window_size (list[int,int]): The new window size.
+
+        Example:
+        ```
+        self.window.resize([600,600])
+        ```
+        """
+
+        # Resize window to specified size        
+        self.window_size = new_window_size
+
+        if self.resizable:
+
+            # Resizable window 
+            self.display_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE,vsync=self.vsync,depth=self.color_depth)
+        else: 
+
+            # Fixed size window
+            self.display_surface = pygame.display.set_mode(self.window_size,pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.NOFRAME,vsync=self.vsync,depth=self.color_depth)
+        self._present_size = None
+        self._reconvert_surfaces()
+
+    def register_surface(self,owner,key,name:str=None) -> None:
+
+        """
+        Registers a display format surface to be reconverted after a display mode change.
+
+        The surface is looked up as owner[key] for dicts and lists and as an attribute otherwise,
+        so owners can replace the surface later. The value can also be a list or dict of surfaces,
+        other values inside of it are left alone.
+
+        Objects are only referenced weakly and drop out once they are deleted.
+        Plain dicts and lists can not be referenced weakly, they stay alive until they are unregistered.
+
+        Args:
+
+        - owner: Dict, list or object holding the surface.
+        - key: Key, index or attribute name of the surface.
+        - name (str)=None: Group in the memory report, the class name of the owner if None.
+
+        Example:
+        ```
+        self.engine.window.register_surface(self,"tile_sprites","Tilemap")
+        self.engine.window.register_surface(self,"sprite")
+        ```
+        """
+
+        # Store where the surface can be found, deleted owners are removed on the way
+        self._registered_surfaces = [entry for entry in self._registered_surfaces if entry[0]() != None]
+        for entry in self._registered_surfaces:
+            if entry[0]() is owner and entry[1] == key:
+                return
+        self._registered_surfaces.append([_owner_reference(owner),key,name])
+
+    def unregister_surface(self,owner,key) -> None:
+
+        """
+        Removes a surface registered with register_surface.
+
+        Args:
+
+        - owner: Dict, list or object holding the surface.
+        - key: Key, index or attribute name of the surface.
+
+        Example:
+        ```
+        self.engine.window.unregister_surface(self,"sprite")
+        ```
+        """
+
+        # Remove stored surface location
+        for index,entry in enumerate(self._registered_surfaces):
+            if entry[0]() is owner and entry[1] == key:
+                del self._registered_surfaces[index]
+                return
+
+    def _reconvert_surfaces(self) -> None:
+
+        """
+        Converts all registered surfaces to the new display format in one batch.
+
+        Nothing is converted if the display format did not change.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Compare display pixel format with the last one
+        display_surface = pygame.display.get_surface()
+        if display_surface == None:
+            return
+        display_format = (display_surface.get_bitsize(),display_surface.get_masks())
+        if self._display_format == None or display_format == self._display_format:
+            self._display_format = display_format
+            return
+        self._display_format = display_format
+
+        # Surfaces shared by several owners are only converted once, deleted owners are skipped
+        start = time.perf_counter()
+        converted = {}
+        self._registered_surfaces = [entry for entry in self._registered_surfaces if entry[0]() != None]
+        for reference,key,name in self._registered_surfaces:
+            owner = reference()
+            if type(owner) in [dict,list]:
+                owner[key] = self._convert_value(owner[key],converted)
+            else:
+                setattr(owner,key,self._convert_value(getattr(owner,key),converted))
+
+        self.engine.logger.info(f"Reconverted {len(converted)} surfaces in {(time.perf_counter()-start)*1000:.2f} ms after display mode change")
+
+    def _convert_value(self,value,converted:dict):
+
+        # Surfaces inside of lists and dicts are replaced in place
+        if isinstance(value,pygame.Surface):
+            return self._convert_once(value,converted)
+        if type(value) == list:
+            for index,item in enumerate(value):
+                value[index] = self._convert_value(item,converted)
+        elif type(value) == dict:
+            for item_key,item in value.items():
+                value[item_key] = self._convert_value(item,converted)
+        return value
+
+    def _convert_once(self,surface:pygame.Surface,converted:dict) -> pygame.Surface:
+
+        # Old surfaces are kept in the dict so their ids stay unique during the batch
+        if id(surface) not in converted:
+            converted[id(surface)] = [surface,surface.convert_alpha()]
+        return converted[id(surface)][1]
+
+    def set_fullscreen(self,fullscreen:bool):
+
+        """
+        Changes window fullscreen state.
+
+        Args:
+
+        - fullscreen (bool): Fullscreen state.
+
+        Example:
+        ```
+        self.window.set_fullscreen(True)
+        ```
+        """
+
+        # Set fullscreen variable, the display is kept alive so the window switches in place
+        self.fullscreen = fullscreen
+        self._create()
+
+    def toggle_fullscreen(self):
+
+        """
+        Toggles window fullscreen state.
+
+        Args:
+
+        - no args are required.
+
+        Example:
+        ```
+        self.window.toggle_fullscreen()
+        ```
+        """
+
+        # Set Fullscreen variable to opposite truth value
+        self.set_fullscreen(not(self.fullscreen))
+
+    def set_name(self,name:str="") -> None:
+
+        """
+        Set a window name.
+
+        Args:
+
+        - name (str)="": New window name.
+
+        Example:
+        ```
+        self.window.set_name("new game")
+        ```
+        """
+
+        # Renaming the displayed window title
+        pygame.display.set_caption(str(name))
+
+    def get_fps(self) -> int:
+
+        """
+        Returns games fps value.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - FPS value as integer.
+
+        Example:
+        ```
+        fps = self.window.get_fps()
+        ```
+        """
+
+        # Returning frames per second as integer
+        return int(min(self.engine.pacer.get_fps(),99999999))
+    
+    def fill(self,color:list[int,int,int],rect:pygame.Rect=None) -> None:
+
+        """
+        Fills window with a color.
+
+        With dirty rects enabled the filled area counts as changed, so filling the whole window every frame
+        turns dirty rects off in practice. Only fill the areas that need to be cleared to benefit from them.
+
+        Args:
+
+        - color (list[int,int,int]): Color the window is filled with.
+        - rect (pygame.Rect)=None: Area to fill, the whole window if None.
+
+        Example:
+        ```
+        self.window.fill([3,13,36])
+        ```
+        """
+
+        # Fills the screen with a solid color
+        rect = self.main_surface.fill(color,rect)
+        if self.engine.dirty_rects:
+            self.engine.display_update_rects.append(rect)
+    
+    def get_size(self) -> list[int,int]:
+
+        """
+        Returns window size as list.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Window size as list of integers.
+
+        Example:
+        ```
+        print(self.window.get_size())
+        ```
+        """
+
+        # Returning window size as a list of integers
+        return self.window_size
+
+    def get_logical_size(self) -> list[int,int]:
+
+        """
+        Returns the fixed resolution the game renders at.
+
+        Args:
+
+        - no args are required.
+
+        Returns:
+
+        - Logical size as list of integers.
+
+        Example:
+        ```
+        print(self.window.get_logical_size())
+        ```
+        """
+
+        # Returning logical size as a list of integers
+        return self.logical_size
+
+
+class Engine:
+    def __init__(self,
+                 catch_error:bool=True,
+                 color_depth:int=16,
+                 delete_old_logs:bool=False,
+                 dirty_rects:bool=False,
+                 fps:int=0,
+                 fullscreen:bool=False,
+                 game_version:str="1.0",
                  language:str="en",
                  logging:bool=True,
+                 logical_size:list=None,
+                 match_refresh_rate:bool=False,
+                 memory_tracing:bool=False,
                  mouse_visible:bool=True,
                  nowindow:bool=False,
+                 profiling:bool=False,
                  resizable:bool=True,
+                 scale_mode:str="smooth",
                  sounds:bool=True,
                  vsync:bool=False,
+                 watchdog:bool=False,
                  window_centered:bool=True,
                  window_name:str="New Game",
                  window_size:list=None):
@@ -1776,6 +5339,7 @@ class Engine:
 
         # Boolean variables go here
         self.catch_error = catch_error
+        self.dirty_rects = dirty_rects
         self.logging = logging
         self.run_game = True
         self.sounds = sounds
@@ -1783,7 +5347,6 @@ class Engine:
         # Integer and float variables go here
         self.fps = fps
         self.delta_time = 1
-        self.last_time = time.time()
 
         # String variables go here
         self.engine_version = "1.1.1"
@@ -1795,117 +5358,220 @@ class Engine:
         self.display_update_rects = []
 
         # Object variables go here
-        self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self)
+        self.clock = self.pacer # Old name of the pacer, games can still read clock.get_fps()
         self._builder = Builder(self)
         self.logger = Logger(self,delete_old_logs)
         self.input = Input(self)
         self.save_manager = SaveManager(self,os.path.join("data","saves","save"))
-        self.window = Window(self,window_size,fullscreen,resizable,nowindow,window_centered,vsync,window_name,mouse_visible,color_depth)
+        self.window = Window(self,window_size,fullscreen,resizable,nowindow,window_centered,vsync,window_name,mouse_visible,color_depth,logical_size,scale_mode)
+        self.screenshot = Screenshot(self)
+        self.recorder = Recorder(self)
+        self.text = Text(self)
+        self.debug_overlay = DebugOverlay(self)
+        self.profiler = Profiler(self,profiling)
+        self.scenes = SceneManager(self)
+        self.scheduler = Scheduler(self)
+        self.jobs = JobSystem(self)
+        self.timers = Timers(self)
+        self.watchdog = Watchdog(self,watchdog)
+        self.memory = Memory(self,memory_tracing)
 
         # Object processing go here
         self.window._create()
-        pygame.event.set_allowed([pygame.QUIT,
-                                  pygame.WINDOWMOVED, 
-                                  pygame.VIDEORESIZE, 
-                                  pygame.KEYDOWN,
-                                  pygame.KEYUP,
-                                  pygame.MOUSEBUTTONDOWN,
-                                  pygame.MOUSEBUTTONUP, 
-                                  pygame.MOUSEMOTION,
-                                  pygame.JOYBUTTONUP, 
-                                  pygame.JOYBUTTONDOWN, 
-                                  pygame.JOYAXISMOTION, 
-                                  pygame.JOYHATMOTION, 
-                                  pygame.JOYDEVICEADDED, 
-                                  pygame.JOYDEVICEREMOVED])
+        if match_refresh_rate:
+            self.pacer.match_refresh_rate()
+        self._event_subscribers = {}
+        self._build_event_table()
 
     def _get_events(self):
-        self.clock.tick(self.fps)
+        self.pacer.tick()
         self.input._update()
+
+        # Handlers of an event type run in order until one returns True
+        event_table = self._event_table
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.quit()
+            handlers = event_table.get(event.type)
+            if handlers != None:
+                for handler in handlers:
+                    if handler(event):
+                        break
+
+    def subscribe(self,event_type:int,callback) -> None:
+
+        """
+        Calls a function for every event of a type.
+
+        Event types nobody listens to are blocked, so subscribing is needed for events like pygame.MOUSEMOTION.
+
+        Args:
+
+        - event_type (int): Pygame event type.
+        - callback: Function called with the event.
+
+        Example:
+        ```
+        self.subscribe(pygame.MOUSEMOTION,self.on_mouse_motion)
+        ```
+        """
+
+        callbacks = self._event_subscribers.setdefault(event_type,[])
+        if callback not in callbacks:
+            callbacks.append(callback)
+            self._build_event_table()
+
+    def unsubscribe(self,event_type:int,callback) -> None:
+
+        """
+        Stops calling a function subscribed with subscribe.
+
+        Args:
+
+        - event_type (int): Pygame event type.
+        - callback: The subscribed function.
+
+        Example:
+        ```
+        self.unsubscribe(pygame.MOUSEMOTION,self.on_mouse_motion)
+        ```
+        """
+
+        callbacks = self._event_subscribers.get(event_type,[])
+        if callback in callbacks:
+            callbacks.remove(callback)
+            self._build_event_table()
+
+    def _build_event_table(self):
+
+        """
+        Builds the event dispatch table and blocks engine event types without handlers.
+
+        Event hooks are only added if the game overwrites them.
+
+        Args:
+
+        - no args are required.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # Engine handlers and the hooks they feed as [hook name, call]
+        engine_events = {
+            pygame.QUIT:[self._handle_quit,[]],
+            pygame.WINDOWMOVED:[self._handle_window_moved,[["event_window_move",lambda event: self.event_window_move([event.x,event.y])],
+                                                            ["event_window_changed",lambda event: self.event_window_changed(event)]]],
+            pygame.VIDEORESIZE:[self._handle_video_resize,[["event_window_resize",lambda event: self.event_window_resize([event.w,event.h])],
+                                                            ["event_window_changed",lambda event: self.event_window_changed(event)]]],
+            pygame.KEYDOWN:[self._handle_keydown,[["event_keydown",lambda event: self.event_keydown(event.key,event.unicode)]]],
+            pygame.KEYUP:[self.input._handle_key_event,[["event_keyup",lambda event: self.event_keyup(event.key,event.unicode)]]],
+            pygame.MOUSEBUTTONDOWN:[self.input._handle_mouse_event,[["event_mouse_buttondown",lambda event: self.event_mouse_buttondown(event.button,self.window.map_position(event.pos))]]],
+            pygame.MOUSEBUTTONUP:[self.input._handle_mouse_event,[["event_mouse_buttonup",lambda event: self.event_mouse_buttonup(event.button,self.window.map_position(event.pos))]]],
+            pygame.MOUSEMOTION:[None,[]],
+            pygame.JOYBUTTONDOWN:[self.input._handle_joy_event,[["event_joystick_buttondown",lambda event: self.event_joystick_buttondown(event.button,event.joy,event.instance_id)]]],
+            pygame.JOYBUTTONUP:[self.input._handle_joy_event,[["event_joystick_buttonup",lambda event: self.event_joystick_buttonup(event.button,event.joy,event.instance_id)]]],
+            pygame.JOYAXISMOTION:[self.input._handle_joy_event,[["event_joystick_axismotion",lambda event: self.event_joystick_axismotion(event.joy,event.instance_id,event.axis,event.value)]]],
+            pygame.JOYHATMOTION:[self.input._handle_joy_event,[["event_joystick_hatmotion",lambda event: self.event_joystick_hatmotion(event.joy,event.instance_id,event.hat,event.value)]]],
+            pygame.JOYDEVICEADDED:[self._handle_joystick_change,[["event_joystick_added",lambda event: self.event_joystick_added(event.device_index,event.guid)]]],
+            pygame.JOYDEVICEREMOVED:[self._handle_joystick_change,[["event_joystick_removed",lambda event: self.event_joystick_removed(event.instance_id)]]]
+        }
+
+        event_table = {}
+        for event_type,(engine_handler,hooks) in engine_events.items():
+            handlers = []
+            if engine_handler != None:
+                handlers.append(engine_handler)
+            for name,hook in hooks:
+                if self._is_overwritten(name):
+                    handlers.append(hook)
+            # Quit passes itself to event_event, so it is only called once
+            if self._is_overwritten("event_event") and event_type != pygame.QUIT:
+                handlers.append(self.event_event)
+            if handlers:
+                event_table[event_type] = handlers
+
+        # Subscribers run after the engine and the hooks
+        for event_type,callbacks in self._event_subscribers.items():
+            if callbacks:
+                event_table[event_type] = event_table.get(event_type,[])+callbacks
+
+        # Engine event types without handlers, like mouse motion, are never queued
+        self._event_table = event_table
+        unhandled = [event_type for event_type in engine_events if event_type not in event_table]
+        if unhandled:
+            pygame.event.set_blocked(unhandled)
+        pygame.event.set_allowed(list(event_table))
+
+    def _is_overwritten(self,name:str) -> bool:
+
+        # Hook of the game class differs from the empty engine hook
+        return getattr(type(self),name) is not getattr(Engine,name)
+
+    def _handle_quit(self,event) -> None:
+        self.quit()
+
+    def _handle_window_moved(self,event) -> None:
+        self.pacer.reset()
+
+    def _handle_video_resize(self,event) -> bool:
+
+        # Resizes while in fullscreen are ignored and not passed on
+        if self.window.fullscreen:
+            return True
+        self.pacer.reset()
+        self.window.resize([event.w,event.h])
+
+    def _handle_keydown(self,event) -> None:
+        self.input._handle_key_event(event)
+        if event.key == pygame.K_F11:
+            self.window.toggle_fullscreen()
+            mode = "fullscreen"
+            if not self.window.fullscreen:
+                mode = "windowed"
+            self.event_window_mode_changed(mode)
+            self.event_window_changed(mode)
+
+    def _handle_joystick_change(self,event) -> None:
+        self.input._init_joysticks()
+
+    def update(self):
+
+        # Update function to overwrite
+        """
+        This function can be overwritten to update the game every frame.
+        By default the active scene is updated.
+
+        Args:
+
+        - No args are required.
+
+        Example:
+        ```
+        def update(self):
+            self.player.update()
+        ```
+        """
+
+        self.scenes.update()
+
+    def draw(self):
+
+        # Draw function to overwrite
+        """
+        This function can be overwritten to draw the game every frame.
+        By default the active scene is drawn.
+
+        Args:
+
+        - No args are required.
+
+        Example:
+        ```
+        def draw(self):
+            self.player.draw()
+        ```
+        """
 
-            # Window events
-            elif event.type == pygame.WINDOWMOVED:
-                self.last_time = time.time()
-                self.delta_time = 0
-                self.event_window_move([event.x,event.y])
-                self.event_window_changed(event)
-                self.event_event(event)
-
-            elif event.type == pygame.VIDEORESIZE:
-                if not self.window.fullscreen:
-                    self.last_time = time.time()
-                    self.delta_time = 0
-                    self.window.resize([event.w,event.h])
-                    self.event_window_resize([event.w,event.h])
-                    self.event_window_changed(event)
-                    self.event_event(event)
-
-            # Keyboard events
-            elif event.type == pygame.KEYDOWN:
-                self.input._handle_key_event(event)
-                if event.key == pygame.K_F11:
-                    self.window.toggle_fullscreen()
-                    mode = "fullscreen"
-                    if not self.window.fullscreen:
-                        mode = "windowed"
-                    self.event_window_mode_changed(mode)
-                    self.event_window_changed(mode)
-                self.event_keydown(event.key,event.unicode)
-                self.event_event(event)
-
-            elif event.type == pygame.KEYUP:
-                self.input._handle_key_event(event)
-                self.event_keyup(event.key,event.unicode)
-                self.event_event(event)
-
-            # Mouse events
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                self.input._handle_mouse_event(event)
-                self.event_mouse_buttondown(event.button,event.pos)
-                self.event_event(event)
-
-            elif event.type == pygame.MOUSEBUTTONUP:
-                self.input._handle_mouse_event(event)
-                self.event_mouse_buttonup(event.button,event.pos)
-                self.event_event(event)
-
-            # Mouse events
-            elif event.type == pygame.MOUSEMOTION:
-                self.event_event(event)
-
-            # Joystick events
-            elif event.type == pygame.JOYBUTTONDOWN:
-                self.input._handle_joy_event(event)
-                self.event_joystick_buttondown(event.button,event.joy,event.instance_id)
-                self.event_event(event)
-
-            elif event.type == pygame.JOYBUTTONUP:
-                self.input._handle_joy_event(event)
-                self.event_joystick_buttonup(event.button,event.joy,event.instance_id)
-                self.event_event(event)
-
-            elif event.type == pygame.JOYAXISMOTION:
-                self.input._handle_joy_event(event)
-                self.event_joystick_axismotion(event.joy,event.instance_id,event.axis,event.value)
-                self.event_event(event)
-
-            elif event.type == pygame.JOYHATMOTION:
-                self.input._handle_joy_event(event)
-                self.event_joystick_hatmotion(event.button)
-                self.event_event(event)
-
-            elif event.type == pygame.JOYDEVICEADDED:
-                self.input._init_joysticks()
-                self.event_joystick_added(event.device_index,event.guid)
-                self.event_event(event)
-
-            elif event.type == pygame.JOYDEVICEREMOVED:
-                self.input._init_joysticks()
-                self.event_joystick_removed(event.instance_id)
-                self.event_event(event)
+        self.scenes.draw()
 
     def event_event(self,event):
 
@@ -2211,16 +5877,41 @@ class Engine:
         ```
         """
 
-    def _engine_update(self):
+    def _engine_update(self,delta_time:float=None):
 
-        # Update that runs before normal update
-        self.delta_time = time.time()-self.last_time
-        self.last_time = time.time()
+        # Update that runs before normal update, headless runs pass a fixed delta time
+        if delta_time == None:
+            self.delta_time = self.pacer.delta_time
+        else:
+            self.delta_time = delta_time
+        self.jobs._update()
+        self.timers._update()
+        self.scheduler._update()
 
     def _engine_draw(self):
 
         # Draw that runs after normal draw
-        pygame.display.update()
+        self.debug_overlay._update()
+        self.window._flush()
+        self.screenshot._update()
+        self.recorder._update()
+        self.input._flush()
+        self.watchdog._update()
+        if self.window.windowless:
+
+            # Nothing to present without a window
+            self.display_update_rects = []
+        elif self.dirty_rects:
+
+            # Only update changed areas of the window
+            rects = self.window._present(self.window._get_update_rects())
+            if rects == None:
+                pygame.display.update()
+            else:
+                pygame.display.update(rects)
+        else:
+            self.window._present()
+            pygame.display.update()
 
     def run(self):
 
@@ -2241,16 +5932,13 @@ class Engine:
 
         # Starting game engine
         self.logger.info(f"Starting [Engine version {self.engine_version} | Game version {self.game_version}]")
+        self.watchdog._start()
         if self.catch_error:
             while self.run_game:
 
                 # Main loop
                 try:
-                    self._get_events()
-                    self._engine_update()
-                    self.update()
-                    self.draw()
-                    self._engine_draw()
+                    self._frame()
                 except Exception as e:
 
                     # Error logging and catching
@@ -2259,15 +5947,106 @@ class Engine:
             while self.run_game:
 
                 # Main loop
-                self._get_events()
-                self._engine_update()
-                self.update()
-                self.draw()
-                self._engine_draw()
+                self._frame()
 
         # Ending game
+        self._engine_quit()
         self.logger.info("Closed game")
 
+    def run_headless(self,frames:int,delta_time:float=1/60,export_path:str=None):
+
+        """
+        Runs the game for a number of frames without waiting for a display.
+
+        Every frame uses the same delta time, so runs are repeatable for benchmarks and image tests.
+
+        Args:
+
+        - frames (int): Number of frames to run.
+        - delta_time (float)=1/60: Delta time of every frame.
+        - export_path (str)=None: Folder every frame is saved to as png, no export if None.
+
+        Example:
+        ```
+        game = Game()
+        game.run_headless(120,export_path="frames")
+        ```
+        """
+
+        # Create export folder
+        if export_path != None and not os.path.exists(export_path):
+            os.makedirs(export_path)
+
+        # Starting game engine
+        self.logger.info(f"Starting headless [Engine version {self.engine_version} | Game version {self.game_version}] for {frames} frames")
+        self.watchdog._start()
+        for frame in range(frames):
+            if not self.run_game:
+                break
+
+            # Main loop with fixed delta time
+            self._frame(delta_time)
+
+            if export_path != None:
+                self.window.export_frame(os.path.join(export_path,f"frame_{frame:05d}.png"))
+
+        # Ending game
+        self._engine_quit()
+        self.logger.info("Closed headless game")
+
+    def _frame(self,delta_time:float=None):
+
+        """
+        Runs one frame of the main loop, the duration of every phase is recorded while the profiler is enabled.
+
+        Args:
+
+        - delta_time (float)=None: Fixed delta time of headless runs, measured and paced if None.
+
+        !!!This is only used internally by the engine and should not be called in a game!!!
+        """
+
+        # cProfile captures start and stop between frames, so every captured frame is complete
+        self.profiler._update_capture()
+
+        # Headless runs only pump events, there is no window to get them from
+        start = time.perf_counter()
+        if delta_time == None:
+            self._get_events()
+        else:
+            pygame.event.pump()
+            self.input._update()
+        events = time.perf_counter()
+
+        self._engine_update(delta_time)
+        engine_update = time.perf_counter()
+        self.update()
+        update = time.perf_counter()
+        self.draw()
+        draw = time.perf_counter()
+        self._engine_draw()
+        end = time.perf_counter()
+
+        if not self.profiler.enabled:
+            return
+        self.profiler.record("events",events-start)
+        self.profiler.record("engine_update",engine_update-events)
+        self.profiler.record("update",update-engine_update)
+        self.profiler.record("draw",draw-update)
+        self.profiler.record("engine_draw",end-draw)
+        self.profiler.record("frame",end-start)
+
+    def _engine_quit(self):
+
+        # Cleanup that runs after the main loop
+        self.watchdog._stop()
+        self.input._stop()
+        self.screenshot._stop()
+        self.recorder._stop()
+        self.jobs._stop()
+        self.profiler._export()
+        self.memory._export()
+
     def quit(self):
 
         """
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import pygame
+import tempfile
+import unittest
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frostlight_engine import Input, KEY_A, KEY_SPACE, PRESSED
+
+class _Logger:
+    def __init__(self) -> None:
+        self.warnings = []
+
+    def warning(self,message:str) -> None:
+        self.warnings.append(message)
+
+class _Engine:
+    def __init__(self) -> None:
+        self.logger = _Logger()
+
+class InputTest(unittest.TestCase):
+    def setUp(self) -> None:
+
+        # Every test starts without a saved input file
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        self.engine = _Engine()
+        self.input = Input(self.engine)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def press(self,key:list[int,int]) -> None:
+        self.input._handle_key_event(pygame.event.Event(pygame.KEYDOWN,key=key[0]))
+
+    def test_keyboard_counts_for_controller_without_joystick(self):
+        self.input.new("jump",KEY_SPACE,PRESSED)
+        self.press(KEY_SPACE)
+        self.assertEqual(self.input.get("jump"),1)
+        self.assertEqual(self.input.get("jump",0),1)
+        self.assertEqual(self.input.get("jump",3),1)
+
+    def test_released_key_is_zero_for_every_controller(self):
+        self.input.new("jump",KEY_SPACE,PRESSED)
+        self.assertEqual(self.input.get("jump"),0)
+        self.assertEqual(self.input.get("jump",0),0)
+
+    def test_load_skips_invalid_bindings(self):
+        os.makedirs(os.path.dirname(self.input.save_path))
+        with open(self.input.save_path,"w") as f:
+            json.dump({"jump":[[KEY_A,PRESSED],"bad",[[0,7],PRESSED],[[0,0],9]],"broken":3},f)
+
+        self.assertTrue(self.input.load())
+        self.assertEqual(self.input._registered_input,{"jump":[[KEY_A,PRESSED]]})
+        self.assertEqual(len(self.engine.logger.warnings),2)
+
+        # Resolving the loaded bindings does not raise
+        self.press(KEY_A)
+        self.assertEqual(self.input.get("jump",0),1)
+
+if __name__ == "__main__":
+    unittest.main()